@@ -1,13 +1,229 @@
+import inspect
+import os
+from types import SimpleNamespace
+
+import numpy as np
 import pandas as pd
-from transformers import pipeline
 import streamlit as st
 
+from preprocessing import encode_series
+from resources import load_lexicon_index, load_stem_cache, load_stop_words
+from profiling import profiler
+from result_cache import ResultCache, text_key
+
+MODEL_NAME = "indobenchmark/indobert-base-p1-sentiment"
+DEFAULT_BATCH_SIZE = 32
+# None = panjang maksimum model (512 untuk IndoBERT), sama dengan pipeline lama; 128 bisa dipilih eksplisit
+DEFAULT_MAX_LENGTH = None
+BACKENDS = ("pytorch", "int8", "onnx")
+DEFAULT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "pytorch")
+ONNX_DIR = os.path.join(".cache", "onnx")
+DEFAULT_CASCADE_MARGIN = 2
+
+# ==== Backend ONNX Runtime ====
+# torch/transformers baru di-import saat model benar-benar dipakai, supaya start aplikasi tetap ringan
+def export_onnx(model, tokenizer, path):
+    import torch
+
+    class _LogitsOnly(torch.nn.Module):
+        def __init__(self, model, input_names):
+            super().__init__()
+            self.model = model
+            self.input_names = input_names
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(self.input_names, inputs))).logits
+
+    sample = tokenizer(["ulasan contoh"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # torch baru memakai exporter dynamo secara default (butuh onnxscript); pakai exporter TorchScript
+    extra = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    model.eval()
+    torch.onnx.export(
+        _LogitsOnly(model, input_names),
+        tuple(sample[name] for name in input_names),
+        path,
+        input_names=input_names,
+        output_names=["logits"],
+        dynamic_axes=dynamic_axes,
+        opset_version=14,
+        **extra,
+    )
+    return path
+
+class OnnxSequenceClassifier:
+    # Antarmuka sama dengan model PyTorch yang dipakai classify_texts
+    def __init__(self, path, config):
+        import onnxruntime as ort
+        import torch
+
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.config = config
+        self.device = torch.device("cpu")
+
+    def eval(self):
+        return self
+
+    def __call__(self, **inputs):
+        import torch
+
+        feed = {name: tensor.cpu().numpy() for name, tensor in inputs.items() if name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+# ==== Load model ====
+def build_backend(model, tokenizer, backend="pytorch", onnx_path=None):
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend tidak dikenal: {backend} (pilih salah satu dari {', '.join(BACKENDS)})")
+    model.eval()
+    if backend == "int8":
+        import torch
+
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if backend == "onnx":
+        onnx_path = onnx_path or os.path.join(ONNX_DIR, model.config.name_or_path.replace("/", "__") + ".onnx")
+        if not os.path.exists(onnx_path):
+            export_onnx(model, tokenizer, onnx_path)
+        return OnnxSequenceClassifier(onnx_path, model.config)
+    return model
+
+@st.cache_resource
+def load_sentiment_model(backend=DEFAULT_BACKEND):
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    with profiler.span("model.load"):
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+        return build_backend(model, tokenizer, backend), tokenizer
+
+@st.cache_resource
+def load_result_cache():
+    return ResultCache()
+
+def model_id_for(backend=DEFAULT_BACKEND, max_length=DEFAULT_MAX_LENGTH):
+    return f"{MODEL_NAME}:{backend}:{max_length or 'max'}"
+
+def resolve_max_length(model, tokenizer, max_length=None):
+    if max_length:
+        return max_length
+    # model_max_length tokenizer tanpa config bisa berupa angka raksasa, jadi dibatasi posisi embedding model
+    limits = [tokenizer.model_max_length, getattr(model.config, "max_position_embeddings", None)]
+    return min(limit for limit in limits if limit)
+
+# ==== Inference batch (urut panjang token, tanpa duplikat) ====
+def classify_texts(texts, model, tokenizer, batch_size=DEFAULT_BATCH_SIZE, max_length=DEFAULT_MAX_LENGTH):
+    import torch
+
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return []
+
+    # Tokenisasi sekali; review dengan panjang mirip masuk batch yang sama supaya padding minimal
+    max_length = resolve_max_length(model, tokenizer, max_length)
+    encoded = tokenizer(unique, truncation=True, max_length=max_length)
+    order = sorted(range(len(unique)), key=lambda i: len(encoded["input_ids"][i]))
+
+    id2label = model.config.id2label
+    results = [None] * len(unique)
+    model.eval()
+    profiler.count("model.inference.items", len(unique))
+    with profiler.span("model.inference"), torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            profiler.observe("model.batch_size", len(idx))
+            batch = tokenizer.pad(
+                {name: [values[i] for i in idx] for name, values in encoded.items()},
+                return_tensors="pt",
+            ).to(model.device)
+            probs = model(**batch).logits.softmax(dim=-1)
+            scores, label_ids = probs.max(dim=-1)
+            for i, label_id, score in zip(idx, label_ids.tolist(), scores.tolist()):
+                results[i] = (id2label[label_id], score)
+
+    lookup = dict(zip(unique, results))
+    return [lookup[text] for text in texts]
+
+# ==== Hanya cache miss yang dikirim ke model ====
+def classify_cached(texts, model, tokenizer, cache, model_id, batch_size=DEFAULT_BATCH_SIZE, max_length=DEFAULT_MAX_LENGTH):
+    keys = [text_key(t) for t in texts]
+    found = cache.get_many(model_id, keys)
+    if profiler.enabled:
+        profiler.count("result_cache.hits", len(found))
+        profiler.count("result_cache.misses", len(set(keys)) - len(found))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+    if missing:
+        fresh = dict(zip(missing, classify_texts(list(missing.values()), model, tokenizer, batch_size, max_length)))
+        cache.put_many(model_id, fresh)
+        found.update(fresh)
+
+    return [found[key] for key in keys]
+
+def _run_model(texts, backend, batch_size, max_length, use_cache):
+    model, tokenizer = load_sentiment_model(backend)
+    if use_cache:
+        cache = load_result_cache()
+        return classify_cached(texts, model, tokenizer, cache, model_id_for(backend, max_length), batch_size, max_length)
+    return classify_texts(texts, model, tokenizer, batch_size, max_length)
+
+def analyze_sentiment(reviews, backend=DEFAULT_BACKEND, batch_size=DEFAULT_BATCH_SIZE, max_length=DEFAULT_MAX_LENGTH, use_cache=True):
+    df = pd.DataFrame(reviews, columns=["review"])
+    results = _run_model(df["review"].astype(str).tolist(), backend, batch_size, max_length, use_cache)
+    df["sentimen"] = [label for label, _ in results]
+    return df
+
+# ==== Cascade: leksikon dulu, model hanya untuk review yang ambigu ====
+def load_lexicon_resources():
+    return load_stop_words(), load_stem_cache(), load_lexicon_index()
+
+def model_label_names(id2label):
+    # Label leksikon diterjemahkan ke nama label model supaya skemanya sama
+    names = {"Positif": "Positif", "Negatif": "Negatif"}
+    for label in id2label.values():
+        if label.lower().startswith("pos"):
+            names["Positif"] = label
+        elif label.lower().startswith("neg"):
+            names["Negatif"] = label
+    return names
+
 @st.cache_resource
-def load_sentiment_model():
-    return pipeline("text-classification", model="indobenchmark/indobert-base-p1-sentiment")
+def load_label_names():
+    # Cukup config-nya saja, bobot model tidak perlu dimuat
+    from transformers import AutoConfig
+
+    return model_label_names(AutoConfig.from_pretrained(MODEL_NAME).id2label)
 
-def analyze_sentiment(reviews):
-    model = load_sentiment_model()
+def analyze_sentiment_cascade(reviews, margin=DEFAULT_CASCADE_MARGIN, backend=DEFAULT_BACKEND, batch_size=DEFAULT_BATCH_SIZE, max_length=DEFAULT_MAX_LENGTH, use_cache=True):
+    stop_words, stem_cache, lexicon_index = load_lexicon_resources()
     df = pd.DataFrame(reviews, columns=["review"])
-    df["sentimen"] = df["review"].apply(lambda x: model(str(x))[0]["label"])
+    codes, unique_corpus = encode_series(df["review"], stop_words, stem_cache)
+    stem_cache.save()
+
+    # Polaritas dihitung sekali per teks unik langsung dari token id, lalu disebar ke semua baris
+    X, vocab = unique_corpus.to_matrix()
+    polarity = lexicon_index.polarities(X, vocab).astype(int)[codes]
+    decisive = np.abs(polarity) >= max(margin, 1)
+    ambiguous = ~decisive
+
+    sentimen = np.where(polarity > 0, "Positif", "Negatif").astype(object)
+    if ambiguous.any():
+        results = _run_model(df.loc[ambiguous, "review"].astype(str).tolist(), backend, batch_size, max_length, use_cache)
+        sentimen[ambiguous] = [label for label, _ in results]
+    if decisive.any():
+        names = load_label_names()
+        sentimen[decisive] = [names[label] for label in sentimen[decisive]]
+
+    df["sentimen"] = sentimen
+    profiler.count("cascade.lexicon", int(decisive.sum()))
+    profiler.count("cascade.model", int(ambiguous.sum()))
+    df["sumber"] = np.where(decisive, "leksikon", "model")
+    df.attrs["model_fraction"] = float(ambiguous.mean()) if len(df) else 0.0
     return df
@@ -1,172 +1,184 @@
 import streamlit as st
 import pandas as pd
-import re
-import nltk
-import matplotlib.pyplot as plt
-import seaborn as sns
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
-from sklearn.decomposition import LatentDirichletAllocation
-from wordcloud import WordCloud
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from downloader import get_comments_from_url
-
-nltk.download('punkt')
-nltk.download('stopwords')
-
-# ==== Load Stopwords ====
-def load_stopwords(file_path):
-    stopwords_list = set(stopwords.words("indonesian"))
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            additional_stopwords = {line.strip() for line in f.readlines()}
-        stopwords_list.update(additional_stopwords)
-    except Exception as e:
-        st.warning(f"Gagal memuat stopword dari file: {e}")
-    return stopwords_list
-
-stop_words = load_stopwords("stopwords.txt")
-stemmer = StemmerFactory().create_stemmer()
-
-# ==== Scrape YouTube ====
-def scrape_youtube_comments(url, limit=300):
-    try:
-        comments = get_comments_from_url(url, sort_by="top", count=limit)
-        df = pd.DataFrame(comments)
-        return df
-    except Exception as e:
-        st.error(f"Gagal mengambil komentar: {e}")
-        return pd.DataFrame()
+from preprocessing import root_words
+from downloader import extract_video_id, fetch_many, iter_comments_cached
+from streaming import StreamingAnalysis, find_comment_column, iter_chunks, STREAM_CHUNK_SIZE
+from delta_sync import sync_video
+from dedup import NearDuplicateIndex, WEIGHT_COL, weighted_counts
+from export import read_table, strip_results
+from profiling import profiler
+from rendering import bar_chart, export_downloads, profiling_panel, profiling_sidebar, wordcloud
+from resources import get_result, load_lexicon_index, load_stem_cache, load_stop_words, store_result
+
+# sklearn (topik) dan matplotlib/seaborn/wordcloud (grafik, lewat rendering.py) baru di-import di tahap yang memakainya
 
 # ==== Preprocessing ====
 def get_root_words(text):
-    text = str(text).lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    words = text.split()
-    return [stemmer.stem(w) for w in words if w not in stop_words and len(w) > 1]
+    return root_words(text, load_stop_words("stopwords.txt"), load_stem_cache())
 
 def clean_text(text):
     return " ".join(get_root_words(text))
 
 # ==== Sentiment ====
-def load_lexicon(file_path):
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return set(line.strip() for line in f.readlines())
-    except Exception as e:
-        st.warning(f"Gagal memuat kamus dari {file_path}: {e}")
-        return set()
-
-positive_words = load_lexicon("positif.txt")
-negative_words = load_lexicon("negatif.txt")
-
 def get_sentiment(text):
-    words = text.split()
-    pos = sum(1 for w in words if w in positive_words)
-    neg = sum(1 for w in words if w in negative_words)
-    if pos > neg:
-        return "Positif"
-    elif neg > pos:
-        return "Negatif"
-    return "Netral"
+    return load_lexicon_index().sentiment(text)
 
 # ==== Emosi ====
-def load_emotion_lexicon(file_path):
-    emotions = {}
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if ":" in line:
-                    emotion, words = line.strip().split(":")
-                    emotions[emotion.strip()] = set(w.strip() for w in words.split(","))
-    except Exception as e:
-        st.warning(f"Gagal memuat leksikon emosi dari {file_path}: {e}")
-    return emotions
-
-emotion_lexicon = load_emotion_lexicon("emosi.txt")
-
 def get_emotion(text):
-    words = text.split()
-    scores = {e: 0 for e in emotion_lexicon}
-    for word in words:
-        for emotion, wordlist in emotion_lexicon.items():
-            if word in wordlist:
-                scores[emotion] += 1
-    return max(scores, key=scores.get) if any(scores.values()) else "Netral"
+    return load_lexicon_index().emotion(text, no_emotion="Netral")
 
 # ==== UI ====
 st.title("📊 Analisis Komentar YouTube (Sentimen, Emosi, Topik)")
+profiling_sidebar()
 
 url = st.text_input("Masukkan URL video YouTube:")
+extra_urls = st.text_area("URL video tambahan (opsional, satu per baris):")
+uploaded = st.file_uploader("Atau muat file hasil/komentar sebelumnya untuk dianalisis ulang tanpa scraping:", type=["parquet", "csv", "jsonl"])
 limit = st.slider("Jumlah komentar:", 50, 5000, 300, 100)
-
-if st.button("Analisis Sekarang") and url:
-    with st.spinner("Mengambil komentar..."):
-        df = scrape_youtube_comments(url, limit)
+parallel = st.checkbox("Preprocessing paralel (multi-core)", value=True)
+fast_render = st.checkbox("Mode tampilan cepat (grafik bawaan, word cloud resolusi rendah)")
+incremental = st.checkbox("Sinkron inkremental (hanya komentar baru, satu video)")
+dedupe = st.checkbox("Gabungkan komentar duplikat/spam (MinHash)", value=True)
+
+urls = [url] + [u.strip() for u in extra_urls.splitlines() if u.strip()]
+run_key = (("file", uploaded.name, uploaded.size) if uploaded else (tuple(urls), limit, "YouTube"), dedupe)
+
+if st.button("Analisis Sekarang") and (url or uploaded):
+    profiler.reset()
+    with st.spinner("Memuat kamus dan stemmer..."):
+        stop_words = load_stop_words("stopwords.txt")
+        stem_cache = load_stem_cache()
+        lexicon_index = load_lexicon_index()
+
+    if incremental and len(urls) == 1 and not uploaded:
+        new_streams = []
+
+        def analyze_new(rows):
+            with StreamingAnalysis(stop_words, stem_cache, lexicon_index, parallel=parallel,
+                                   dedup=NearDuplicateIndex() if dedupe else None) as new_stream:
+                new_stream.add_chunk(rows)
+            new_streams.append(new_stream)
+            return new_stream.result(), new_stream.corpus()
+
+        with st.spinner("Mengambil komentar baru sejak analisis terakhir..."):
+            try:
+                df, corpus, new_df = sync_video(url, analyze_new, max_new=limit)
+            except Exception as e:
+                st.error(f"Gagal mengambil komentar: {e}")
+                st.stop()
+        st.caption(f"{len(new_df)} komentar baru dianalisis, total {len(df)} komentar tersimpan.")
+        if df.empty:
+            st.warning("Tidak ada komentar ditemukan.")
+            st.stop()
+        comment_col = find_comment_column(df.columns)
+        # Topic model hanya belajar dari komentar baru, bobot kata dihitung dari semua komentar
+        topic_batches = [batch for new_stream in new_streams for batch in new_stream.batches]
+        weight_batches = [(*corpus.to_matrix(), df["clean_text"])] if not df.empty else []
+    else:
+        if uploaded:
+            comment_source = strip_results(read_table(uploaded, uploaded.name)).to_dict("records")
+        elif len(urls) > 1:
+            with st.spinner(f"Mengambil komentar dari {len(urls)} video..."):
+                fetched, errors = fetch_many(urls, sort_by="top", count=limit)
+            for failed_url, e in errors.items():
+                st.warning(f"Gagal mengambil komentar {failed_url}: {e}")
+            comment_source = [row for video_url, video_df in fetched.items() for row in video_df.assign(video=video_url).to_dict("records")]
+        else:
+            comment_source = iter_comments_cached(url, sort_by="top", count=limit)
+        total = len(comment_source) if uploaded else limit * len(urls)
+
+        progress = st.progress(0.0, text="Mengambil komentar...")
+        live_sentiment, live_emotion = st.columns(2)
+        live_sentiment, live_emotion = live_sentiment.empty(), live_emotion.empty()
+        stream = StreamingAnalysis(stop_words, stem_cache, lexicon_index, parallel=parallel,
+                                   dedup=NearDuplicateIndex() if dedupe else None)
+        chunks = iter_chunks(comment_source, STREAM_CHUNK_SIZE)
+        try:
+            with profiler.span("stream"):
+                while True:
+                    # Hanya pengambilan komentar yang ditangkap; error di analisis tetap muncul apa adanya
+                    try:
+                        chunk = next(chunks, None)
+                    except Exception as e:
+                        st.error(f"Gagal mengambil komentar: {e}")
+                        break
+                    if chunk is None:
+                        break
+                    stream.add_chunk(chunk)
+                    progress.progress(min(stream.received / total, 1.0), text=f"{stream.received}/{total} komentar diproses")
+                    live_sentiment.bar_chart(pd.Series(stream.sentiment_counts, dtype=int))
+                    live_emotion.bar_chart(pd.Series(stream.emotion_counts, dtype=int))
+        finally:
+            # Worker stemming dipakai untuk semua chunk, baru dimatikan setelah stream selesai
+            stream.close()
+        profiler.count("stream.items", stream.received)
+        progress.empty()
+        live_sentiment.empty()
+        live_emotion.empty()
+
+        if stream.received == 0:
+            st.warning("Tidak ada komentar ditemukan.")
+            st.stop()
+
+        if stream.comment_col is None:
+            st.error("Kolom komentar tidak ditemukan.")
+            st.stop()
+        comment_col = stream.comment_col
+        df = stream.result()
+        corpus = stream.corpus()
+        if stream.dedup is not None:
+            st.caption(f"{stream.received} komentar digabung menjadi {stream.dedup.n_groups} grup (near-duplicate/spam).")
+        topic_batches = weight_batches = stream.batches
+
+    stem_cache.save()
+    cache_stats = stem_cache.stats()
+    st.caption(f"Cache stemming: {cache_stats['hits']} hit, {cache_stats['misses']} miss ({cache_stats['hit_rate']:.0%})")
 
     if df.empty:
-        st.warning("Tidak ada komentar ditemukan.")
+        st.warning("Komentar kosong setelah dibersihkan.")
         st.stop()
 
-    comment_col = next((col for col in df.columns if "text" in col.lower() or "comment" in col.lower()), None)
-    if not comment_col:
-        st.error("Kolom komentar tidak ditemukan.")
-        st.stop()
+    # LDA Topik
+    from scipy import sparse
+    from topics import load_topic_model, save_topic_model, summarize_topics
 
-    df["root_words"] = df[comment_col].astype(str).apply(get_root_words)
-    df["clean_text"] = df["root_words"].apply(lambda x: " ".join(x))
-    df = df[df["clean_text"].str.strip() != ""]
+    topic_key = f"file:{uploaded.name}" if uploaded else "youtube:" + ",".join(sorted(extract_video_id(u) for u in urls))
+    topic_model = load_topic_model(topic_key)
+    for X_batch, vocab_batch, texts_batch in topic_batches:
+        topic_model.update(X_batch, vocab_batch, texts_batch)
+    save_topic_model(topic_model, topic_key)
 
-    if df.empty:
-        st.warning("Komentar kosong setelah dibersihkan.")
-        st.stop()
+    X_topics = sparse.vstack([topic_model.hash_matrix(X_batch, vocab_batch) for X_batch, vocab_batch, _ in weight_batches]).tocsr()
+    summary = summarize_topics(topic_model, 10, X_topics)
+    store_result(run_key, {"df": df, "corpus": corpus, "comment_col": comment_col, "topics": summary})
 
-    df["sentimen"] = df["clean_text"].apply(get_sentiment)
-    df["emosi"] = df["clean_text"].apply(get_emotion)
+# ==== Hasil (tetap tampil saat widget lain diubah) ====
+analysis = get_result(run_key)
+if analysis:
+    df, comment_col, summary = analysis["df"], analysis["comment_col"], analysis["topics"]
 
     # Sentimen Chart
     st.subheader("📈 Distribusi Sentimen")
-    sentimen_counts = df["sentimen"].value_counts()
-    fig, ax = plt.subplots()
-    sns.barplot(x=sentimen_counts.index, y=sentimen_counts.values, palette="Set2", ax=ax)
-    ax.set_ylabel("Jumlah Komentar")
-    st.pyplot(fig)
+    bar_chart(weighted_counts(df, "sentimen"), palette="Set2", fast=fast_render)
 
     # Emosi Chart
     st.subheader("😊 Distribusi Emosi")
-    emosi_counts = df["emosi"].value_counts()
-    fig, ax = plt.subplots()
-    sns.barplot(x=emosi_counts.index, y=emosi_counts.values, palette="Set3", ax=ax)
-    ax.set_ylabel("Jumlah Komentar")
-    st.pyplot(fig)
+    bar_chart(weighted_counts(df, "emosi"), palette="Set3", fast=fast_render)
 
     # LDA Topik
     st.subheader("🧠 Topik Komentar (LDA + WordCloud)")
-    vectorizer = CountVectorizer(max_df=0.9, min_df=2)
-    X = vectorizer.fit_transform(df["clean_text"])
-    lda = LatentDirichletAllocation(n_components=5, random_state=42)
-    lda.fit(X)
-
-    vocab = vectorizer.get_feature_names_out()
-    tfidf = TfidfTransformer().fit_transform(X)
-    topik_freq = {}
-
-    for i, topic in enumerate(lda.components_):
-        top_idx = topic.argsort()[:-11:-1]
-        top_words = [(vocab[j], tfidf[:, j].mean()) for j in top_idx]
-        label = vocab[top_idx[0]]
-        st.markdown(f"**Topik {i+1}: {label.capitalize()}**")
-        st.write(", ".join(w for w, _ in top_words))
-        for w, score in top_words:
-            topik_freq[w] = topik_freq.get(w, 0) + score
-
-    wc = WordCloud(width=800, height=500, background_color="white").generate_from_frequencies(topik_freq)
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wc, interpolation="bilinear")
-    ax.axis("off")
-    st.pyplot(fig)
+    if not summary.topics:
+        st.info("Komentar belum cukup untuk membentuk topik.")
+    else:
+        for i, (label, top_words) in enumerate(zip(summary.labels, summary.topics)):
+            st.markdown(f"**Topik {i+1}: {label.capitalize()}**")
+            st.write(", ".join(w for w, _ in top_words))
+
+        wordcloud(summary.frequencies, fast=fast_render)
 
     with st.expander("📥 Lihat & Unduh Data"):
-        st.dataframe(df[[comment_col, "clean_text", "sentimen", "emosi"]])
-        st.download_button("📄 Unduh Data CSV", df.to_csv(index=False).encode("utf-8"), "komentar_analisis.csv", "text/csv")
+        st.dataframe(df[[c for c in (comment_col, "clean_text", "sentimen", "emosi", WEIGHT_COL) if c in df.columns]])
+        # File dibuat hanya saat diminta; Parquet bisa dimuat ulang lewat uploader di atas
+        export_downloads(analysis.setdefault("downloads", {}), "data", df, "komentar_analisis", corpus=analysis["corpus"])
+
+profiling_panel()
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+from collections import namedtuple
+
+from browser_pool import block_heavy_resources
+from scroll_extract import scroll_and_extract_async
+
+ScrapeResult = namedtuple("ScrapeResult", ["url", "platform", "comments", "error", "attempts"])
+
+PLATFORMS = {
+    "google_maps": {
+        "open": "button[jsaction='pane.reviewChart.moreReviews']",
+        "item": "div[data-review-id]",
+        "text": ["span[jsname='fbQN7e']", "span[jsname='bN97Pc']"],
+        "key": "data-review-id",
+    },
+    "tiktok": {
+        "open": None,
+        "item": '[data-e2e="comment-list-item"]',
+        "text": ['[data-e2e="comment-level-1"]'],
+        "key": None,
+    },
+}
+
+
+def detect_platform(url):
+    url = url.lower()
+    if "tiktok.com" in url:
+        return "tiktok"
+    if ("google." in url and "/maps" in url) or "maps.app.goo.gl" in url or "goo.gl/maps" in url:
+        return "google_maps"
+    return None
+
+
+def _as_source(source):
+    # Sumber bisa berupa URL saja atau (url, platform), misalnya untuk fixture file://
+    if isinstance(source, (tuple, list)):
+        return source[0], source[1]
+    return source, detect_platform(source)
+
+
+async def _scrape_one(context, semaphore, url, platform, limit, retries, timeout, backoff):
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    if platform not in PLATFORMS:
+        return ScrapeResult(url, platform, [], "URL tidak dikenali sebagai Google Maps/TikTok", 0)
+    config = PLATFORMS[platform]
+
+    error = None
+    for attempt in range(1, retries + 2):
+        async with semaphore:
+            page = None
+            try:
+                # Gagal membuat page juga dihitung sebagai percobaan gagal untuk sumber ini saja
+                page = await context.new_page()
+                await page.goto(url, timeout=timeout)
+                if config["open"]:
+                    try:
+                        button = await page.wait_for_selector(config["open"], timeout=5000)
+                        await button.click()
+                    except PlaywrightTimeoutError:
+                        pass
+                await page.wait_for_selector(config["item"], timeout=timeout)
+                items = await scroll_and_extract_async(page, config["item"], config["text"], limit, key_attr=config["key"])
+                return ScrapeResult(url, platform, [item["text"] for item in items], None, attempt)
+            except Exception as e:
+                error = e
+            finally:
+                if page is not None:
+                    await page.close()
+        if attempt <= retries:
+            await asyncio.sleep(backoff * attempt)
+
+    return ScrapeResult(url, platform, [], str(error), retries + 1)
+
+
+# ==== Scrape banyak sumber sekaligus, hasil keluar begitu tiap sumber selesai ====
+async def iter_scrape(sources, limit=100, max_pages=4, retries=2, timeout=30000, backoff=1.0, headless=True):
+    # Playwright baru di-import saat ada sumber Maps/TikTok yang di-scrape
+    from playwright.async_api import async_playwright
+
+    sources = [_as_source(s) for s in sources]
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        await context.route("**/*", block_heavy_resources)
+        semaphore = asyncio.Semaphore(max_pages)
+
+        tasks = [
+            asyncio.create_task(_scrape_one(context, semaphore, url, platform, limit, retries, timeout, backoff))
+            for url, platform in sources
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser.close()
+
+
+def scrape_many(sources, limit=100, on_result=None, **options):
+    async def collect():
+        results = []
+        async for result in iter_scrape(sources, limit, **options):
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    return asyncio.run(collect())
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from collections import Counter
+
+import pandas as pd
+
+from corpus import Vocabulary
+from dedup import weighted_counts
+from export import with_root_words
+from lexicon import load_lexicon_index
+from preprocessing import create_stem_pool, load_stopword_set
+from profiling import profiler
+from stem_cache import StemCache, create_stemmer
+from streaming import analyze_frame, find_comment_column
+
+DEFAULT_CHUNK_SIZE = 20000
+
+
+# ==== Baca file besar per chunk (CSV atau JSONL seperti review.csv) ====
+def is_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+    return path.endswith(".jsonl") or first == "{"
+
+
+def iter_input_chunks(path, chunksize=DEFAULT_CHUNK_SIZE):
+    if is_jsonl(path):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, on_bad_lines="skip")
+    with reader:
+        yield from reader
+
+
+# ==== Tulis hasil per chunk (append), format ikut ekstensi output ====
+def write_chunk(f, df, output_format, header):
+    if output_format == "jsonl":
+        text = df.to_json(orient="records", lines=True, force_ascii=False)
+        if text and not text.endswith("\n"):
+            text += "\n"
+    else:
+        text = df.to_csv(index=False, header=header)
+    f.write(text.encode("utf-8"))
+    f.flush()
+    os.fsync(f.fileno())
+    return f.tell()
+
+
+# ==== Checkpoint: posisi input/output + state agregat, ditulis atomik setelah tiap chunk ====
+def checkpoint_path(output):
+    return f"{output}.ckpt"
+
+
+def load_checkpoint(output, input_path, chunksize):
+    path = checkpoint_path(output)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state["input"] != os.path.abspath(input_path) or state["chunksize"] != chunksize:
+        raise ValueError("Checkpoint berasal dari input atau --chunk-size yang berbeda, jalankan ulang tanpa --resume.")
+    return state
+
+
+def save_checkpoint(output, state):
+    path = checkpoint_path(output)
+    with open(f"{path}.tmp", "wb") as f:
+        pickle.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def analyze_file(input_path, output, column=None, chunksize=DEFAULT_CHUNK_SIZE, jobs=1, resume=False,
+                 n_topics=5, no_emotion="Netral", stopwords_path="stopwords.txt", log=None):
+    output_format = "jsonl" if output.endswith((".jsonl", ".json")) else "csv"
+    stem_cache = StemCache(create_stemmer())
+    stop_words = load_stopword_set(stopwords_path)
+    lexicon_index = load_lexicon_index(stem_cache)
+    # Satu vocabulary untuk semua chunk, jadi tiap kata dasar hanya disimpan sekali sebagai str
+    vocabulary = Vocabulary()
+
+    state = load_checkpoint(output, input_path, chunksize) if resume else None
+    if state is None:
+        topic_model = None
+        if n_topics:
+            from topics import TopicModel
+
+            topic_model = TopicModel(n_topics=n_topics)
+        state = {
+            "input": os.path.abspath(input_path),
+            "chunksize": chunksize,
+            "chunks_done": 0,
+            "rows_in": 0,
+            "rows_out": 0,
+            "output_bytes": 0,
+            "column": column,
+            "sentiment_counts": Counter(),
+            "emotion_counts": Counter(),
+            "topic_model": topic_model,
+        }
+
+    pool = create_stem_pool(stop_words, jobs) if jobs > 1 else None
+    start = time.perf_counter()
+    try:
+        with open(output, "ab" if state["chunks_done"] else "wb") as f:
+            # Buang sisa tulisan chunk yang belum sempat di-checkpoint sebelum crash
+            f.truncate(state["output_bytes"])
+            f.seek(state["output_bytes"])
+            for i, chunk in enumerate(iter_input_chunks(input_path, chunksize)):
+                if i < state["chunks_done"]:
+                    continue
+                if state["column"] is None:
+                    state["column"] = find_comment_column(chunk.columns) or "review"
+                if state["column"] not in chunk.columns:
+                    raise KeyError(f"Kolom '{state['column']}' tidak ditemukan di {input_path}.")
+
+                df, X, vocab, corpus = analyze_frame(chunk, state["column"], stop_words, stem_cache, lexicon_index,
+                                                     no_emotion, parallel=pool is not None, n_jobs=jobs, pool=pool,
+                                                     vocabulary=vocabulary)
+                if not df.empty:
+                    state["output_bytes"] = write_chunk(f, with_root_words(df, corpus), output_format, header=state["rows_out"] == 0)
+                    # Input hasil export dedup membawa kolom bobot: satu baris mewakili beberapa komentar
+                    state["sentiment_counts"].update(weighted_counts(df, "sentimen").astype(int).to_dict())
+                    state["emotion_counts"].update(weighted_counts(df, "emosi").astype(int).to_dict())
+                    if state["topic_model"] is not None:
+                        # Tanpa daftar dokumen yang sudah dilihat, supaya memori tidak tumbuh per baris
+                        state["topic_model"].update(X, vocab)
+
+                state["chunks_done"] = i + 1
+                state["rows_in"] += len(chunk)
+                state["rows_out"] += len(df)
+                save_checkpoint(output, state)
+                stem_cache.save()
+                if log:
+                    rate = state["rows_in"] / max(time.perf_counter() - start, 1e-9)
+                    log(f"chunk {i + 1}: {state['rows_in']} baris dibaca, {state['rows_out']} ditulis ({rate:.0f} baris/detik sesi ini)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return state
+
+
+def write_summary(output, state, n_words=10):
+    summary = {
+        "rows_in": state["rows_in"],
+        "rows_out": state["rows_out"],
+        "sentimen": dict(state["sentiment_counts"]),
+        "emosi": dict(state["emotion_counts"]),
+        "topics": [],
+    }
+    if state["topic_model"] is not None:
+        from topics import summarize_topics
+
+        topics = summarize_topics(state["topic_model"], n_words)
+        summary["topics"] = [
+            {"label": label, "words": [w for w, _ in words]}
+            for label, words in zip(topics.labels, topics.topics)
+        ]
+    path = f"{output}.summary.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisis komentar (kata dasar, sentimen, emosi, topik) dari file besar tanpa Streamlit.")
+    parser.add_argument("input", help="File CSV/JSONL berisi komentar")
+    parser.add_argument("output", help="File hasil (.csv atau .jsonl), ditulis per chunk")
+    parser.add_argument("--column", help="Kolom komentar (default: dideteksi otomatis, lalu 'review')")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--jobs", type=int, default=1, help="Jumlah proses untuk stemming (1 = tanpa multiprocessing)")
+    parser.add_argument("--resume", action="store_true", help="Lanjutkan dari checkpoint terakhir setelah crash")
+    parser.add_argument("--topics", type=int, default=5, help="Jumlah topik LDA (0 = tanpa topik)")
+    parser.add_argument("--stopwords", default="stopwords.txt")
+    parser.add_argument("--profile", metavar="PATH", help="Simpan profil per tahap (JSON) ke file ini")
+    args = parser.parse_args()
+    profiler.enable(bool(args.profile))
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    state = analyze_file(args.input, args.output, args.column, args.chunk_size, args.jobs, args.resume,
+                         args.topics, stopwords_path=args.stopwords, log=log)
+    path, summary = write_summary(args.output, state)
+    print(json.dumps({k: summary[k] for k in ("rows_in", "rows_out", "sentimen", "emosi")}, ensure_ascii=False))
+    log(f"Ringkasan ditulis ke {path}")
+    if args.profile:
+        with open(args.profile, "w", encoding="utf-8") as f:
+            f.write(profiler.to_json())
+        log(f"Profil ditulis ke {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from analyzer import DEFAULT_BATCH_SIZE, DEFAULT_MAX_LENGTH, classify_texts
+from lexicon import LexiconIndex, build_document_term_matrix, read_emotion_lexicon, read_word_list
+from preprocessing import encode_series, root_words
+from stem_cache import StemCache, create_stemmer
+from topics import TopicModel
+
+SIZES = (1000, 10000, 100000)
+STAGES = ("root_words", "sentiment", "emotion", "encode_series", "lexicon_score", "topics", "model")
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+# Kenaikan memori di bawah ini dianggap noise, berapa pun persentasenya
+MEMORY_SLACK_MB = 1.0
+DEFAULT_MODEL_ROWS = 2000
+
+# Proporsi token per sumber kata di komentar sintetis
+WORD_MIX = (("stop", 0.5), ("positive", 0.2), ("negative", 0.2), ("emotion", 0.1))
+DUPLICATE_RATE = 0.1
+DECORATIONS = ("!!", "??", "😂", "👍", "...", "https://youtu.be/abc123")
+
+
+# ==== Korpus sintetis dari kamus repo (deterministik per seed, tanpa jaringan) ====
+def load_word_pools(positive_path="positif.txt", negative_path="negatif.txt", emotion_path="emosi.txt", stopwords_path="stopwords.txt"):
+    emotions = read_emotion_lexicon(emotion_path)
+    # Diurutkan karena urutan set str berubah antar proses (hash randomization)
+    return {
+        "positive": sorted(read_word_list(positive_path)),
+        "negative": sorted(read_word_list(negative_path)),
+        "emotion": sorted({w for words in emotions.values() for w in words if w}),
+        "stop": sorted(read_word_list(stopwords_path)),
+    }
+
+
+def synthetic_comments(n, pools, seed=42, min_words=3, max_words=30):
+    rng = random.Random(seed)
+    names = [name for name, _ in WORD_MIX if pools.get(name)]
+    weights = [weight for name, weight in WORD_MIX if pools.get(name)]
+    comments = []
+    for _ in range(n):
+        # Sebagian komentar diulang persis, seperti spam/salin-tempel di kolom komentar asli
+        if comments and rng.random() < DUPLICATE_RATE:
+            comments.append(rng.choice(comments))
+            continue
+        length = rng.randint(min_words, max_words)
+        words = [rng.choice(pools[name]) for name in rng.choices(names, weights, k=length)]
+        if rng.random() < 0.3:
+            words[0] = words[0].capitalize()
+        if rng.random() < 0.2:
+            words.append(rng.choice(DECORATIONS))
+        comments.append(" ".join(words))
+    return comments
+
+
+# ==== Model kecil lokal: arsitektur BERT mini dengan vocab dari korpus, bobot acak ====
+def tiny_model(words, folder, max_length=DEFAULT_MAX_LENGTH, seed=0):
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    vocab_path = os.path.join(folder, "vocab.txt")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted({t for w in words for t in w.lower().split()})))
+    tokenizer = BertTokenizerFast(vocab_file=vocab_path, do_lower_case=True)
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=max_length or 512,
+        num_labels=3,
+        id2label={0: "positive", 1: "neutral", 2: "negative"},
+        label2id={"positive": 0, "neutral": 1, "negative": 2},
+    )
+    return BertForSequenceClassification(config), tokenizer
+
+
+# ==== Tahap yang diukur (ctx disiapkan sekali per ukuran korpus, di luar waktu ukur) ====
+def fresh_stem_cache(ctx):
+    # Dipanggil di luar waktu ukur sebelum tiap putaran: stemmer Sastrawi tanpa cache dan StemCache
+    # kosong tanpa file, supaya putaran berikutnya tidak ikut menikmati kata dasar putaran sebelumnya
+    ctx["stem_cache"] = StemCache(create_stemmer(), path=None)
+
+
+def stage_root_words(ctx):
+    for text in ctx["texts"]:
+        root_words(text, ctx["stop_words"], ctx["stem_cache"])
+
+
+def stage_sentiment(ctx):
+    for text in ctx["clean"]:
+        ctx["lexicon_index"].sentiment(text)
+
+
+def stage_emotion(ctx):
+    for text in ctx["clean"]:
+        ctx["lexicon_index"].emotion(text, no_emotion="Netral")
+
+
+def stage_encode_series(ctx):
+    encode_series(ctx["series"], ctx["stop_words"], ctx["stem_cache"], parallel=False)
+
+
+def stage_lexicon_score(ctx):
+    X, vocab = ctx["unique_corpus"].to_matrix()
+    ctx["lexicon_index"].score(X, vocab)
+
+
+def stage_topics(ctx):
+    X, vocab = build_document_term_matrix(ctx["clean"])
+    TopicModel(n_topics=ctx["n_topics"], passes=1, total_samples=len(ctx["clean"])).update(X, vocab)
+
+
+def stage_model(ctx):
+    classify_texts(ctx["model_texts"], ctx["model"], ctx["tokenizer"], ctx["batch_size"])
+
+
+STAGE_FUNCTIONS = {
+    "root_words": stage_root_words,
+    "sentiment": stage_sentiment,
+    "emotion": stage_emotion,
+    "encode_series": stage_encode_series,
+    "lexicon_score": stage_lexicon_score,
+    "topics": stage_topics,
+    "model": stage_model,
+}
+STAGE_SETUP = {
+    "root_words": fresh_stem_cache,
+    "encode_series": fresh_stem_cache,
+}
+
+
+def prepare_context(texts, stop_words, lexicon_index, model=None, tokenizer=None,
+                    model_rows=DEFAULT_MODEL_ROWS, batch_size=DEFAULT_BATCH_SIZE, n_topics=5):
+    stem_cache = StemCache(create_stemmer(), path=None)
+    series = pd.Series(texts)
+    codes, unique_corpus = encode_series(series, stop_words, stem_cache, parallel=False)
+    unique_clean = unique_corpus.texts()
+    return {
+        "texts": texts,
+        "series": series,
+        "clean": [unique_clean[code] for code in codes],
+        "unique_corpus": unique_corpus,
+        "stop_words": stop_words,
+        "lexicon_index": lexicon_index,
+        "n_topics": n_topics,
+        "model": model,
+        "tokenizer": tokenizer,
+        "model_texts": texts[:model_rows],
+        "batch_size": batch_size,
+    }
+
+
+# ==== Pengukuran: median waktu dari beberapa putaran, memori dari satu putaran terpisah ====
+def measure_stage(stage, ctx, repeat=3, trace_memory=True, setup=None):
+    seconds = []
+    for _ in range(repeat):
+        if setup:
+            setup(ctx)
+        start = time.perf_counter()
+        stage(ctx)
+        seconds.append(time.perf_counter() - start)
+    peak_mb = None
+    if trace_memory:
+        # tracemalloc memperlambat kode Python, jadi tidak dipakai saat mengukur waktu.
+        # Alokasi numpy/scipy ikut tercatat, tensor torch tidak.
+        if setup:
+            setup(ctx)
+        tracemalloc.start()
+        try:
+            stage(ctx)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return statistics.median(seconds), peak_mb
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def run_benchmarks(sizes=SIZES, stages=STAGES, repeat=3, seed=42, trace_memory=True,
+                   model_rows=DEFAULT_MODEL_ROWS, batch_size=DEFAULT_BATCH_SIZE, log=None):
+    log = log or (lambda message: None)
+    pools = load_word_pools()
+    stop_words = frozenset(pools["stop"])
+    lexicon_index = LexiconIndex(
+        read_word_list("positif.txt"), read_word_list("negatif.txt"), read_emotion_lexicon("emosi.txt"),
+        StemCache(create_stemmer(), path=None),
+    )
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        model, tokenizer, model_error = None, None, None
+        if "model" in stages:
+            try:
+                model, tokenizer = tiny_model([w for pool in pools.values() for w in pool], folder)
+            except ImportError as e:
+                model_error = f"{type(e).__name__}: {e}"
+
+        for size in sizes:
+            log(f"Menyiapkan korpus sintetis {size} komentar...")
+            texts = synthetic_comments(size, pools, seed)
+            ctx = prepare_context(texts, stop_words, lexicon_index, model, tokenizer, model_rows, batch_size)
+            for name in stages:
+                rows = len(ctx["model_texts"]) if name == "model" else size
+                row = {"size": size, "stage": name, "rows": rows, "seconds": None, "rows_per_s": None, "peak_mb": None, "error": None}
+                if name == "model" and model is None:
+                    row["error"] = model_error
+                    results.append(row)
+                    continue
+                if name == "model":
+                    # Warm-up satu batch (alokasi awal torch) di luar waktu ukur
+                    classify_texts(ctx["model_texts"][:batch_size], model, tokenizer, batch_size)
+                log(f"  {name} ({rows} baris)")
+                seconds, peak_mb = measure_stage(STAGE_FUNCTIONS[name], ctx, repeat, trace_memory, STAGE_SETUP.get(name))
+                row.update(
+                    seconds=round(seconds, 4),
+                    rows_per_s=round(rows / seconds, 1) if seconds else None,
+                    peak_mb=round(peak_mb, 2) if peak_mb is not None else None,
+                )
+                results.append(row)
+
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "model_rows": model_rows,
+        "batch_size": batch_size,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    return {"meta": meta, "results": results}
+
+
+# ==== Bandingkan dengan baseline tersimpan ====
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(report, path):
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def find_regressions(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    reference = {(row["stage"], row["size"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in report["results"]:
+        base = reference.get((row["stage"], row["size"]))
+        if base is None or row["rows_per_s"] is None or base.get("rows_per_s") is None:
+            continue
+        if row["rows_per_s"] < base["rows_per_s"] * (1 - tolerance):
+            regressions.append(f"{row['stage']}@{row['size']}: {row['rows_per_s']} baris/s < baseline {base['rows_per_s']} baris/s")
+        if row["peak_mb"] is not None and base.get("peak_mb") is not None:
+            limit = max(base["peak_mb"] * (1 + tolerance), base["peak_mb"] + MEMORY_SLACK_MB)
+            if row["peak_mb"] > limit:
+                regressions.append(f"{row['stage']}@{row['size']}: memori {row['peak_mb']} MB > baseline {base['peak_mb']} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tiap tahap analisis pada korpus komentar sintetis (offline).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Jumlah komentar per korpus")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah putaran per tahap (diambil median)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-rows", type=int, default=DEFAULT_MODEL_ROWS, help="Batas komentar untuk tahap model")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran memori (tracemalloc)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="File baseline JSON untuk deteksi regresi")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil ini sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Penurunan throughput / kenaikan memori relatif yang masih diterima")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    report = run_benchmarks(args.sizes, args.stages, args.repeat, args.seed, not args.no_memory,
+                            args.model_rows, args.batch_size, log=log)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(pd.DataFrame(report["results"]).to_string(index=False))
+        print(f"Peak RSS proses: {report['meta']['peak_rss_mb']} MB")
+
+    if args.save_baseline:
+        save_baseline(report, args.baseline)
+        log(f"Baseline disimpan ke {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        log(f"Baseline {args.baseline} belum ada, jalankan dengan --save-baseline untuk membuatnya.")
+        sys.exit(0)
+    regressions = find_regressions(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"Regresi: {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+ENTRY_POINTS = ("app.py", "new.py", "review.py", "scrape.py")
+# Library berat yang seharusnya belum dimuat sebelum pengguna menjalankan analisis
+HEAVY_MODULES = ("torch", "transformers", "playwright", "sklearn", "matplotlib", "seaborn", "wordcloud", "nltk", "onnxruntime")
+
+# Dijalankan di proses Python baru supaya tiap entry point benar-benar cold start
+PROBE = r"""
+import json, runpy, sys, time
+start = time.perf_counter()
+error = None
+try:
+    runpy.run_path(sys.argv[1], run_name="__main__")
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+seconds = time.perf_counter() - start
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+except ImportError:
+    import psutil
+    peak_mb = psutil.Process().memory_info().peak_wset / (1024 * 1024)
+heavy = sorted(m for m in sys.argv[2].split(",") if m in sys.modules)
+print("BENCH " + json.dumps({"import_s": seconds, "peak_rss_mb": peak_mb, "heavy_modules": heavy, "error": error}))
+"""
+
+
+def measure_entry_point(path, python=sys.executable, heavy_modules=HEAVY_MODULES):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-c", PROBE, path, ",".join(heavy_modules)],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(path)) or ".",
+    )
+    wall_seconds = time.perf_counter() - start
+    line = next((l for l in reversed(proc.stdout.splitlines()) if l.startswith("BENCH ")), None)
+    if line is None:
+        return {"import_s": None, "peak_rss_mb": None, "heavy_modules": [], "wall_s": wall_seconds,
+                "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"}
+    result = json.loads(line[len("BENCH "):])
+    result["wall_s"] = wall_seconds
+    return result
+
+
+def benchmark_startup(entry_points=ENTRY_POINTS, repeat=3):
+    report = []
+    for path in entry_points:
+        runs = [measure_entry_point(path) for _ in range(repeat)]
+        ok = [r for r in runs if r["import_s"] is not None]
+        report.append({
+            "entry_point": os.path.basename(path),
+            "import_s": round(statistics.median(r["import_s"] for r in ok), 3) if ok else None,
+            "wall_s": round(statistics.median(r["wall_s"] for r in runs), 3),
+            "peak_rss_mb": round(max(r["peak_rss_mb"] for r in ok), 1) if ok else None,
+            "heavy_modules": ",".join(ok[-1]["heavy_modules"]) if ok else "",
+            "error": next((r["error"] for r in runs if r["error"]), None),
+        })
+    return report
+
+
+def over_budget(report, max_seconds=None, max_rss_mb=None):
+    failures = []
+    for row in report:
+        if max_seconds is not None and (row["import_s"] is None or row["import_s"] > max_seconds):
+            failures.append(f"{row['entry_point']}: import {row['import_s']} s > {max_seconds} s")
+        if max_rss_mb is not None and (row["peak_rss_mb"] is None or row["peak_rss_mb"] > max_rss_mb):
+            failures.append(f"{row['entry_point']}: RSS {row['peak_rss_mb']} MB > {max_rss_mb} MB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur waktu import dan memori (RSS) cold start tiap entry point Streamlit.")
+    parser.add_argument("entry_points", nargs="*", default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah proses baru per entry point (diambil median)")
+    parser.add_argument("--max-seconds", type=float, help="Gagal (exit 1) kalau waktu import melebihi batas ini")
+    parser.add_argument("--max-rss-mb", type=float, help="Gagal (exit 1) kalau peak RSS melebihi batas ini")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    report = benchmark_startup(args.entry_points, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(pd.DataFrame(report).to_string(index=False))
+
+    failures = over_budget(report, args.max_seconds, args.max_rss_mb)
+    for failure in failures:
+        print(f"Melebihi budget: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
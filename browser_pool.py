@@ -0,0 +1,156 @@
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+# Batas tunggu run(); scrape normal selesai jauh sebelum ini
+DEFAULT_RUN_TIMEOUT = 300
+
+
+def block_heavy_resources(route):
+    # Dipakai API sync dan async: di API async hasilnya coroutine, dan Playwright menunggunya sendiri
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return route.abort()
+    return route.continue_()
+
+
+# ==== Pool browser headless yang tetap hangat ====
+# Objek sync Playwright terikat ke thread yang membuatnya, jadi tiap browser
+# punya thread worker sendiri dan semua pemakaian page dijalankan di sana.
+class BrowserPool:
+    def __init__(self, size=1, pages_per_context=20, headless=True, block_resources=True, launch_options=None):
+        self.size = size
+        self.pages_per_context = pages_per_context
+        self.headless = headless
+        self.block_resources = block_resources
+        self.launch_options = launch_options or {}
+        self.stats = {"launches": 0, "contexts": 0, "pages": 0}
+        self._stats_lock = threading.Lock()
+        self._tasks = queue.Queue()
+        self._closed = False
+        self._alive = size
+        self._error = None
+        self._state_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"browser-pool-{i}", daemon=True)
+            for i in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _worker(self):
+        playwright = browser = context = None
+        pages_used = 0
+        error = None
+        try:
+            # Playwright baru di-import saat pool pertama kali dipakai
+            from playwright.sync_api import sync_playwright
+
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                future, fn, args, kwargs = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None or not browser.is_connected():
+                        playwright = playwright or sync_playwright().start()
+                        browser = playwright.chromium.launch(headless=self.headless, **self.launch_options)
+                        context = None
+                        self._count("launches")
+                    # Context di-recycle supaya cookie/cache/memori tidak menumpuk
+                    if context is None or pages_used >= self.pages_per_context:
+                        if context is not None:
+                            context.close()
+                        context = browser.new_context()
+                        if self.block_resources:
+                            context.route("**/*", block_heavy_resources)
+                        pages_used = 0
+                        self._count("contexts")
+
+                    page = context.new_page()
+                    pages_used += 1
+                    self._count("pages")
+                    try:
+                        future.set_result(fn(page, *args, **kwargs))
+                    finally:
+                        page.close()
+                except BaseException as e:
+                    if not future.done():
+                        future.set_exception(e)
+        except BaseException as e:
+            error = e
+        finally:
+            for closer in (context and context.close, browser and browser.close, playwright and playwright.stop):
+                try:
+                    if closer:
+                        closer()
+                except Exception:
+                    pass
+            self._worker_exited(error)
+
+    def _worker_exited(self, error):
+        with self._state_lock:
+            self._alive -= 1
+            if error is not None and self._error is None:
+                self._error = error
+            if self._alive > 0:
+                return
+        # Worker terakhir mati: task yang masih antre tidak akan pernah dijalankan, jadi digagalkan
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if task is not None and task[0].set_running_or_notify_cancel():
+                task[0].set_exception(self._dead_error())
+
+    def _dead_error(self):
+        return RuntimeError(f"BrowserPool tidak punya worker yang hidup: {self._error}")
+
+    @property
+    def dead(self):
+        return self._alive == 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        # Dicek di bawah lock yang sama dengan _worker_exited, jadi task tidak bisa masuk antrean yang sudah mati
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool sudah ditutup.")
+            if self.dead:
+                raise self._dead_error()
+            self._tasks.put((future, fn, args, kwargs))
+        return future
+
+    def run(self, fn, *args, timeout=DEFAULT_RUN_TIMEOUT, **kwargs):
+        return self.submit(fn, *args, **kwargs).result(timeout=timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join(timeout=30)
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_browser_pool(size=1):
+    global _shared_pool
+    with _shared_lock:
+        # Pool yang worker-nya mati (mis. Playwright belum terpasang) diganti saat dipakai lagi
+        if _shared_pool is None or _shared_pool.dead:
+            _shared_pool = BrowserPool(size=size)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
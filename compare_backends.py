@@ -0,0 +1,82 @@
+import argparse
+import json
+import time
+
+import pandas as pd
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from analyzer import BACKENDS, DEFAULT_BATCH_SIZE, DEFAULT_MAX_LENGTH, MODEL_NAME, build_backend, classify_texts
+
+
+def load_reviews(path, column="review"):
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+    # review.csv sebenarnya berisi satu objek JSON per baris
+    if path.endswith(".jsonl") or first == "{":
+        df = pd.read_json(path, lines=True)
+    else:
+        df = pd.read_csv(path, on_bad_lines="skip")
+    return df[column].dropna().astype(str).tolist()
+
+
+def compare_backends(texts, backends=BACKENDS, model_name=MODEL_NAME, batch_size=DEFAULT_BATCH_SIZE, max_length=DEFAULT_MAX_LENGTH):
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    report = []
+    reference = None
+
+    for backend in backends:
+        start = time.perf_counter()
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model = build_backend(model, tokenizer, backend)
+        load_seconds = time.perf_counter() - start
+
+        classify_texts(texts[:batch_size], model, tokenizer, batch_size, max_length)  # warm-up
+        start = time.perf_counter()
+        results = classify_texts(texts, model, tokenizer, batch_size, max_length)
+        seconds = time.perf_counter() - start
+
+        labels = [label for label, _ in results]
+        scores = [score for _, score in results]
+        if reference is None:
+            reference = (labels, scores)
+        agreement = sum(a == b for a, b in zip(labels, reference[0])) / len(labels)
+        score_diff = sum(abs(a - b) for a, b in zip(scores, reference[1])) / len(scores)
+
+        report.append({
+            "backend": backend,
+            "load_s": round(load_seconds, 3),
+            "infer_s": round(seconds, 3),
+            "reviews_per_s": round(len(texts) / seconds, 1) if seconds else None,
+            "label_agreement": round(agreement, 4),
+            "mean_score_diff": round(score_diff, 4),
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan akurasi & latensi backend model sentimen terhadap fp32.")
+    parser.add_argument("input", help="File CSV/JSONL berisi kolom review")
+    parser.add_argument("--column", default="review")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH, help="Batas token per review (default: panjang maksimum model)")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    texts = load_reviews(args.input, args.column)[:args.limit]
+    if not texts:
+        parser.error("Tidak ada review di file input.")
+
+    # Backend pertama jadi acuan, jadi fp32 selalu diletakkan paling depan
+    backends = sorted(args.backends, key=lambda b: b != "pytorch")
+    report = compare_backends(texts, backends, batch_size=args.batch_size, max_length=args.max_length)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(pd.DataFrame(report).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import numpy as np
+from scipy import sparse
+
+
+# ==== Vocabulary: token -> id int32, satu objek str per token ====
+class Vocabulary:
+    def __init__(self, tokens=()):
+        self.tokens = []
+        self._ids = {}
+        for token in tokens:
+            self.intern(token)
+
+    def intern(self, token):
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self._ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, tokens):
+        return [self.intern(t) for t in tokens]
+
+    def lookup(self, ids):
+        return np.asarray(self.tokens, dtype=object)[ids]
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self._ids
+
+
+# ==== Korpus gaya CSR: semua token id dalam satu array int32 + offset per dokumen ====
+# Dokumen i = ids[offsets[i]:offsets[i + 1]]. Diisi sekali saat preprocessing,
+# lalu dipakai langsung oleh skor leksikon, topic model, dan export tanpa split ulang.
+class TokenCorpus:
+    def __init__(self, ids, offsets, vocabulary):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_token_lists(cls, token_lists, vocabulary=None):
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        offsets = np.zeros(len(token_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = np.fromiter(
+            (vocabulary.intern(t) for tokens in token_lists for t in tokens),
+            dtype=np.int32,
+            count=int(offsets[-1]),
+        )
+        return cls(ids, offsets, vocabulary)
+
+    @classmethod
+    def concat(cls, corpora, vocabulary=None):
+        # Gabung baris beberapa korpus; id dipetakan ulang kalau vocabulary-nya berbeda.
+        # Vocabulary hanya bertambah, jadi id korpus yang sudah memakainya tetap berlaku
+        corpora = list(corpora)
+        if vocabulary is None:
+            vocabulary = corpora[0].vocabulary if corpora else Vocabulary()
+        ids, offsets, start = [], [np.zeros(1, dtype=np.int64)], 0
+        for corpus in corpora:
+            if corpus.vocabulary is vocabulary:
+                ids.append(corpus.ids)
+            else:
+                mapping = np.array(vocabulary.encode(corpus.vocabulary.tokens), dtype=np.int32)
+                ids.append(mapping[corpus.ids])
+            offsets.append(corpus.offsets[1:] + start)
+            start += int(corpus.offsets[-1])
+        return cls(np.concatenate(ids) if ids else [], np.concatenate(offsets), vocabulary)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.offsets.nbytes
+
+    def take(self, rows):
+        # Ambil/ulang dokumen tertentu (mis. dari kode pd.factorize) tanpa menyentuh token sebagai str
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+        starts, lengths = self.offsets[rows], self.lengths[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return TokenCorpus(self.ids[positions], offsets, self.vocabulary)
+
+    def doc_ids(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def token_lists(self):
+        tokens = self.vocabulary.tokens
+        ids, offsets = self.ids.tolist(), self.offsets.tolist()
+        return [[tokens[j] for j in ids[offsets[i]:offsets[i + 1]]] for i in range(len(self))]
+
+    def texts(self):
+        return [" ".join(tokens) for tokens in self.token_lists()]
+
+    def to_matrix(self, compact=True):
+        # Document-term matrix langsung dari array id, tanpa CountVectorizer
+        n_cols = len(self.vocabulary)
+        # copy=True: sum_duplicates mengurutkan indices di tempat, urutan token korpus tidak boleh ikut berubah
+        X = sparse.csr_matrix(
+            (np.ones(len(self.ids), dtype=np.int64), self.ids, self.offsets),
+            shape=(len(self), n_cols),
+            copy=True,
+        )
+        X.sum_duplicates()
+        if not compact:
+            return X, np.asarray(self.vocabulary.tokens, dtype=object)
+        # Hanya kolom token yang muncul di korpus ini, supaya lebar matriks tidak ikut vocabulary global
+        used = np.unique(self.ids)
+        return X[:, used], self.vocabulary.lookup(used)
@@ -0,0 +1,154 @@
+import re
+import zlib
+
+import numpy as np
+
+from preprocessing import normalize_text
+from profiling import profiler
+
+WEIGHT_COL = "bobot"
+GROUP_COL = "grup"
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM = 64
+# 8 band x 8 baris: pasangan dengan Jaccard ~0.77 ke atas hampir pasti jatuh di bucket yang sama
+NUM_BANDS = 8
+SHINGLE_SIZE = 5
+# Batas elemen matriks (permutasi x shingle) per blok, supaya memori signature tetap kecil
+MAX_BLOCK_SHINGLES = 50000
+
+MERSENNE_PRIME = (1 << 31) - 1
+SPACE_PATTERN = re.compile(r"\s+")
+
+
+def dedup_key(text):
+    return SPACE_PATTERN.sub(" ", normalize_text(text)).strip()
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    # Shingle karakter tahan terhadap typo kecil, emoji, dan tanda baca yang berbeda
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8")) % MERSENNE_PRIME}
+    return {zlib.crc32(text[i:i + size].encode("utf-8")) % MERSENNE_PRIME for i in range(len(text) - size + 1)}
+
+
+# ==== Index MinHash + LSH yang bisa diisi bertahap (per chunk) ====
+class NearDuplicateIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, num_bands=NUM_BANDS, shingle_size=SHINGLE_SIZE, seed=1):
+        if num_perm % num_bands:
+            raise ValueError("num_perm harus habis dibagi num_bands")
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows_per_band = num_perm // num_bands
+        self.shingle_size = shingle_size
+        self.buckets = [{} for _ in range(num_bands)]
+        self.exact = {}
+        self.signatures = {}
+        self.counts = {}
+        self.n = 0
+
+    def signatures_for(self, keys):
+        # (a * x + b) mod p untuk semua shingle sekaligus, lalu minimum per dokumen (reduceat)
+        hashes = [np.fromiter(shingle_hashes(k, self.shingle_size), dtype=np.uint64) for k in keys]
+        result = np.empty((len(keys), len(self.a)), dtype=np.uint32)
+        start = 0
+        while start < len(keys):
+            stop, total = start, 0
+            while stop < len(keys) and (stop == start or total + len(hashes[stop]) <= MAX_BLOCK_SHINGLES):
+                total += len(hashes[stop])
+                stop += 1
+            block = hashes[start:stop]
+            offsets = np.zeros(len(block), dtype=np.int64)
+            np.cumsum([len(h) for h in block[:-1]], out=offsets[1:])
+            values = (self.a[:, None] * np.concatenate(block)[None, :] + self.b[:, None]) % np.uint64(MERSENNE_PRIME)
+            result[start:stop] = np.minimum.reduceat(values, offsets, axis=1).T
+            start = stop
+        return result
+
+    def _band_keys(self, signature):
+        r = self.rows_per_band
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.num_bands)]
+
+    def _match(self, signature, band_keys):
+        checked = set()
+        for band, key in enumerate(band_keys):
+            rep = self.buckets[band].get(key)
+            if rep is None or rep in checked:
+                continue
+            checked.add(rep)
+            # Estimasi Jaccard = fraksi nilai MinHash yang sama
+            if np.mean(self.signatures[rep] == signature) >= self.threshold:
+                return rep
+        return None
+
+    def add(self, texts, weights=None):
+        profiler.count("dedup.items", len(texts))
+        with profiler.span("dedup"):
+            groups = self._add(texts, weights)
+        if profiler.enabled:
+            offset = self.n - len(groups)
+            profiler.count("dedup.duplicates", int(np.count_nonzero(groups != offset + np.arange(len(groups)))))
+        return groups
+
+    def _add(self, texts, weights=None):
+        # Hasil: id grup per teks = posisi global (urutan masuk) teks representatifnya.
+        # weights: bobot awal tiap teks (mis. kolom bobot dari export yang dimuat ulang), default 1
+        keys = [dedup_key(t) for t in texts]
+        groups = np.empty(len(keys), dtype=np.int64)
+        pending = {}
+        for i, key in enumerate(keys):
+            rep = self.exact.get(key)
+            if rep is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                groups[i] = rep
+
+        unique_keys = list(pending)
+        signatures = self.signatures_for(unique_keys) if unique_keys else []
+        # Urut posisi kemunculan pertama supaya representatif = komentar paling awal
+        for key, signature in sorted(zip(unique_keys, signatures), key=lambda item: pending[item[0]][0]):
+            rows = pending[key]
+            band_keys = self._band_keys(signature)
+            rep = self._match(signature, band_keys) if key else None
+            if rep is None:
+                rep = self.n + rows[0]
+                self.signatures[rep] = signature
+                for band, band_key in enumerate(band_keys):
+                    self.buckets[band].setdefault(band_key, rep)
+            self.exact[key] = rep
+            groups[rows] = rep
+
+        reps, inverse = np.unique(groups, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights, minlength=len(reps)) if len(groups) else []
+        for rep, count in zip(reps, counts):
+            self.counts[int(rep)] = self.counts.get(int(rep), 0) + int(count)
+        self.n += len(keys)
+        return groups
+
+    @property
+    def n_groups(self):
+        return len(self.counts)
+
+
+# ==== Satu representatif per grup, jumlah anggota grup jadi bobot ====
+def collapse_duplicates(df, text_col, index=None):
+    index = index or NearDuplicateIndex()
+    offset = index.n
+    # File hasil dedup yang dianalisis ulang: bobot lama tiap representatif ikut dijumlahkan
+    weights = df[WEIGHT_COL].fillna(1).to_numpy(dtype=float) if WEIGHT_COL in df.columns else None
+    groups = index.add(df[text_col].tolist(), weights)
+    is_rep = groups == offset + np.arange(len(groups))
+    reps = df[is_rep].copy()
+    reps[GROUP_COL] = groups[is_rep]
+    reps[WEIGHT_COL] = reps[GROUP_COL].map(index.counts).astype(int)
+    return reps, groups
+
+
+def weighted_counts(df, col, weight_col=WEIGHT_COL):
+    # Data lama tanpa kolom bobot dihitung satu komentar = satu
+    if weight_col not in df.columns:
+        return df[col].value_counts()
+    weights = df[weight_col].fillna(1)
+    return weights.groupby(df[col], observed=True).sum().sort_values(ascending=False)
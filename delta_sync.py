@@ -0,0 +1,98 @@
+import itertools
+import json
+import os
+import time
+
+import pandas as pd
+
+from corpus import TokenCorpus
+from downloader import extract_video_id, iter_comments
+from export import read_table, with_root_words, write_parquet
+
+STATE_DIR = os.path.join(".cache", "delta")
+# Komentar yang disematkan selalu muncul paling atas, jadi berhenti setelah beberapa komentar lama berturut-turut
+STOP_AFTER_SEEN = 10
+
+
+# ==== State per video: dataset teranalisis + id komentar yang sudah dilihat ====
+def _state_paths(url, state_dir=STATE_DIR):
+    video_id = extract_video_id(url)
+    return os.path.join(state_dir, f"{video_id}.parquet"), os.path.join(state_dir, f"{video_id}.json")
+
+
+def load_state(url, state_dir=STATE_DIR):
+    data_path, meta_path = _state_paths(url, state_dir)
+    if not os.path.exists(meta_path):
+        return None, None, {"video_id": extract_video_id(url), "seen_ids": [], "newest_time": None, "updated_at": None}
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if not os.path.exists(data_path):
+        return None, None, meta
+    stored = read_table(data_path)
+    # Kolom list root_words jadi TokenCorpus lagi (id int32), tidak ditahan sebagai list str per baris
+    if "root_words" in stored.columns:
+        token_lists = stored.pop("root_words").tolist()
+    else:
+        token_lists = stored["clean_text"].fillna("").str.split().tolist() if "clean_text" in stored.columns else [[]] * len(stored)
+    return stored, TokenCorpus.from_token_lists(token_lists), meta
+
+
+def save_state(url, df, corpus, meta, state_dir=STATE_DIR):
+    data_path, meta_path = _state_paths(url, state_dir)
+    os.makedirs(state_dir, exist_ok=True)
+    write_parquet(with_root_words(df, corpus), f"{data_path}.tmp")
+    os.replace(f"{data_path}.tmp", data_path)
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+
+# ==== Ambil komentar terbaru sampai ketemu yang sudah pernah dilihat ====
+def iter_new_comments(rows, seen_ids, stop_after_seen=STOP_AFTER_SEEN):
+    seen_run = 0
+    fresh = set()
+    for row in rows:
+        cid = row.get("cid")
+        if cid in seen_ids:
+            seen_run += 1
+            if seen_run >= stop_after_seen:
+                break
+            continue
+        seen_run = 0
+        if cid in fresh:
+            continue
+        fresh.add(cid)
+        yield row
+
+
+# analyze(rows) -> (df, corpus) dengan corpus sejajar baris df; hasil: (gabungan, corpus gabungan, df baru)
+def sync_video(url, analyze, generator=None, max_new=5000, stop_after_seen=STOP_AFTER_SEEN, state_dir=STATE_DIR):
+    stored, stored_corpus, meta = load_state(url, state_dir)
+    seen_ids = set(meta["seen_ids"])
+
+    if generator is None:
+        from youtube_comment_downloader import YoutubeCommentDownloader
+
+        generator = YoutubeCommentDownloader().get_comments_from_url(url, sort_by="recent")
+    rows = iter_comments(generator, count=float("inf"))
+    new_rows = list(itertools.islice(iter_new_comments(rows, seen_ids, stop_after_seen), max_new))
+
+    if not new_rows:
+        if stored is None:
+            return pd.DataFrame(), TokenCorpus.concat([]), pd.DataFrame()
+        return stored, stored_corpus, pd.DataFrame()
+
+    # Hanya komentar baru yang dipreproses dan diskor
+    new_df, new_corpus = analyze(new_rows)
+    parts = [(f, c) for f, c in ((new_df, new_corpus), (stored, stored_corpus)) if f is not None and not f.empty]
+    merged = pd.concat([f for f, _ in parts], ignore_index=True) if parts else pd.DataFrame()
+    merged_corpus = TokenCorpus.concat([c for _, c in parts])
+
+    times = [row["time_parsed"] for row in new_rows if row.get("time_parsed") is not None]
+    if meta["newest_time"] is not None:
+        times.append(meta["newest_time"])
+    meta["seen_ids"] = sorted(seen_ids.union(row["cid"] for row in new_rows))
+    meta["newest_time"] = max(times) if times else None
+    meta["updated_at"] = time.time()
+    save_state(url, merged, merged_corpus, meta, state_dir)
+    return merged, merged_corpus, new_df
@@ -1,6 +1,19 @@
 # downloader.py
-from youtube_comment_downloader import YoutubeCommentDownloader
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
+import hashlib
+import os
 import re
+import tempfile
+import time
+
+import pandas as pd
+
+from profiling import profiler
+
+COMMENT_COLUMNS = ["cid", "username", "text", "time", "time_parsed", "likes"]
+CACHE_DIR = os.path.join(".cache", "youtube")
+CACHE_TTL = 6 * 60 * 60
 
 def parse_likes(votes_str):
     try:
@@ -11,24 +24,104 @@ def parse_likes(votes_str):
     except:
         return 0
 
-def get_comments_from_url(url, sort_by="top", count=300):
-    downloader = YoutubeCommentDownloader()
-    generator = downloader.get_comments_from_url(url, sort_by=sort_by)
-
-    comments = []
+def iter_comments(generator, count=300):
+    # Generator mentah dari YoutubeCommentDownloader (atau tiruannya) -> baris komentar
+    collected = 0
     for comment in generator:
         try:
             like_str = comment.get("votes", "0")
             likes = parse_likes(like_str)
-            comments.append({
+            row = {
+                "cid": comment.get("cid", ""),
                 "username": comment.get("author", ""),
                 "text": comment.get("text", ""),
                 "time": comment.get("time", ""),
+                "time_parsed": comment.get("time_parsed"),
                 "likes": likes
-            })
-            if len(comments) >= count:
-                break
+            }
         except Exception:
             continue
+        yield row
+        collected += 1
+        if collected >= count:
+            break
+
+def iter_comments_from_url(url, sort_by="top", count=300):
+    from youtube_comment_downloader import YoutubeCommentDownloader
+
+    downloader = YoutubeCommentDownloader()
+    yield from iter_comments(downloader.get_comments_from_url(url, sort_by=sort_by), count)
+
+def get_comments_from_url(url, sort_by="top", count=300):
+    return list(iter_comments_from_url(url, sort_by=sort_by, count=count))
+
+# ==== Cache hasil di disk (Parquet) ====
+def extract_video_id(url):
+    match = re.search(r"(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})", url)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+def cache_path(url, sort_by="top", count=300, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{extract_video_id(url)}_{sort_by}_{count}.parquet")
+
+def load_cached_comments(url, sort_by="top", count=300, ttl=CACHE_TTL, cache_dir=CACHE_DIR):
+    path = cache_path(url, sort_by, count, cache_dir)
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) > ttl:
+        profiler.count("fetch.cache.misses")
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:
+        profiler.count("fetch.cache.misses")
+        return None
+    profiler.count("fetch.cache.hits")
+    return df
+
+def save_cached_comments(df, url, sort_by="top", count=300, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Tiap request menulis ke file sementara sendiri, lalu diganti secara atomik
+    fd, tmp_path = tempfile.mkstemp(suffix=".parquet.tmp", dir=cache_dir)
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path(url, sort_by, count, cache_dir))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def fetch_comments(url, sort_by="top", count=300, ttl=CACHE_TTL, cache_dir=CACHE_DIR):
+    cached = load_cached_comments(url, sort_by, count, ttl, cache_dir)
+    if cached is not None:
+        return cached
+    with profiler.span("fetch"):
+        df = pd.DataFrame(get_comments_from_url(url, sort_by=sort_by, count=count), columns=COMMENT_COLUMNS)
+    profiler.count("fetch.items", len(df))
+    save_cached_comments(df, url, sort_by, count, cache_dir)
+    return df
+
+def iter_comments_cached(url, sort_by="top", count=300, ttl=CACHE_TTL, cache_dir=CACHE_DIR):
+    cached = load_cached_comments(url, sort_by, count, ttl, cache_dir)
+    if cached is not None:
+        yield from cached.to_dict("records")
+        return
+    rows = []
+    for row in profiler.iterate("fetch", iter_comments_from_url(url, sort_by=sort_by, count=count)):
+        rows.append(row)
+        yield row
+    # Hanya hasil fetch yang selesai penuh yang disimpan
+    save_cached_comments(pd.DataFrame(rows, columns=COMMENT_COLUMNS), url, sort_by, count, cache_dir)
 
-    return comments
+# ==== Ambil banyak video paralel ====
+def fetch_many(urls, sort_by="top", count=300, max_workers=4, ttl=CACHE_TTL, cache_dir=CACHE_DIR):
+    results, errors = {}, {}
+    with profiler.span("fetch.many"), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Tiap thread dapat salinan context supaya span/counter masuk ke profiler sesi pemanggil
+        futures = {pool.submit(contextvars.copy_context().run, fetch_comments, url, sort_by, count, ttl, cache_dir): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                errors[url] = e
+    return {url: results[url] for url in urls if url in results}, errors
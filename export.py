@@ -0,0 +1,93 @@
+import ast
+import io
+
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ("sentimen", "emosi", "sumber")
+LIST_COLUMNS = ("root_words",)
+# Kolom hasil analisis, dibuang saat file dimuat ulang untuk dianalisis lagi.
+# bobot tetap dibawa: satu baris export hasil dedup mewakili beberapa komentar
+RESULT_COLUMNS = ("root_words", "clean_text", "sentimen", "emosi", "grup")
+
+PARQUET_MIME = "application/vnd.apache.parquet"
+
+
+# ==== DataFrame hasil -> tabel Arrow (kategori + kolom list) ====
+def with_root_words(df, corpus):
+    # Token per baris disimpan sebagai TokenCorpus (sejajar dengan baris df); kolom list root_words
+    # dibuat dari token id itu saat export/tampil saja, tanpa split ulang clean_text
+    return df.assign(root_words=corpus.token_lists())
+
+
+def to_arrow_table(df):
+    import pyarrow as pa
+
+    df = df.copy(deep=False)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    lists = {col: df.pop(col) for col in LIST_COLUMNS if col in df.columns}
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col, values in lists.items():
+        # list<string> asli Arrow, bukan list Python yang di-pickle sebagai object
+        array = pa.array([list(v) if v is not None else [] for v in values], type=pa.list_(pa.string()))
+        table = table.append_column(col, array)
+    return table
+
+
+def write_parquet(df, path_or_buffer):
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_arrow_table(df), path_or_buffer, compression="zstd")
+
+
+def to_parquet_bytes(df):
+    buffer = io.BytesIO()
+    write_parquet(df, buffer)
+    return buffer.getvalue()
+
+
+def to_csv_bytes(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+EXPORT_FORMATS = {
+    "parquet": (to_parquet_bytes, ".parquet", PARQUET_MIME),
+    "csv": (to_csv_bytes, ".csv", "text/csv"),
+}
+
+
+# ==== Baca kembali file export / dump komentar ====
+def _as_list(value):
+    # Parquet/JSONL: array/list asli. CSV: repr list Python ("['a', 'b']"). Sel kosong/NaN: list kosong.
+    if isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value.split()
+        return [str(v) for v in value] if isinstance(value, (list, tuple)) else []
+    if hasattr(value, "__len__"):
+        return list(value)
+    return []
+
+
+def read_table(file, name=None):
+    name = (name or getattr(file, "name", None) or str(file)).lower()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    if name.endswith(".parquet"):
+        df = pd.read_parquet(file)
+    elif name.endswith((".jsonl", ".json")):
+        df = pd.read_json(file, lines=True)
+    else:
+        df = pd.read_csv(file)
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = [_as_list(v) for v in df[col]]
+    return df
+
+
+def strip_results(df):
+    return df.drop(columns=[c for c in RESULT_COLUMNS if c in df.columns])
+
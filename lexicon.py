@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from profiling import profiler
+
+SENTIMENT_LABELS = np.array(["Negatif", "Netral", "Positif"], dtype=object)
+
+
+# ==== Document-term matrix ====
+def build_document_term_matrix(texts, vocabulary=None):
+    # clean_text sudah berupa token kata dasar yang dipisah spasi
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vectorizer = CountVectorizer(tokenizer=str.split, lowercase=False, token_pattern=None, vocabulary=vocabulary)
+    X = vectorizer.fit_transform(texts)
+    return X, vectorizer.get_feature_names_out()
+
+
+# ==== Load leksikon dari file ====
+def read_word_list(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def read_emotion_lexicon(file_path):
+    emotions = {}
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if ":" in line:
+                emotion, words = line.strip().split(":")
+                emotions[emotion.strip()] = set(w.strip() for w in words.split(","))
+    return emotions
+
+
+def load_lexicon_index(stemmer=None, positive_path="positif.txt", negative_path="negatif.txt", emotion_path="emosi.txt"):
+    return LexiconIndex(
+        read_word_list(positive_path),
+        read_word_list(negative_path),
+        read_emotion_lexicon(emotion_path),
+        stemmer,
+    )
+
+
+# ==== Indeks leksikon: token -> (polaritas, id emosi) ====
+class LexiconIndex:
+    def __init__(self, positive_words, negative_words, emotion_lexicon, stemmer=None):
+        self.emotions = list(emotion_lexicon)
+        entries = {}
+        positive = self._forms_of(positive_words, None)
+        negative = self._forms_of(negative_words, None)
+        for token in positive:
+            entries.setdefault(token, [0, 0, set()])[0] = 1
+        for token in negative:
+            entries.setdefault(token, [0, 0, set()])[1] = 1
+        # Kata asli di leksikon menang: bentuk dasar kata negatif (mis. menyenangkan -> senang) tidak
+        # boleh menetralkan kata positif yang memang ada di kamus, dan sebaliknya
+        if stemmer is not None:
+            for token in self._forms_of(positive_words, stemmer) - positive - negative:
+                entries.setdefault(token, [0, 0, set()])[0] = 1
+            for token in self._forms_of(negative_words, stemmer) - negative - positive:
+                entries.setdefault(token, [0, 0, set()])[1] = 1
+        for emotion_id, emotion in enumerate(self.emotions):
+            for word in emotion_lexicon[emotion]:
+                for token in self._forms(word, stemmer):
+                    entries.setdefault(token, [0, 0, set()])[2].add(emotion_id)
+
+        self.index = {
+            token: (pos - neg, tuple(sorted(emotion_ids)))
+            for token, (pos, neg, emotion_ids) in entries.items()
+        }
+
+    @staticmethod
+    def _forms(word, stemmer):
+        word = word.strip().lower()
+        if not word:
+            return set()
+        # Teks sudah di-stem, jadi leksikon juga harus cocok dengan bentuk dasarnya
+        # StemCache kosong bernilai falsy (__len__), jadi dicek terhadap None
+        return {word, stemmer.stem(word)} if stemmer is not None else {word}
+
+    @classmethod
+    def _forms_of(cls, words, stemmer):
+        return {token for word in words for token in cls._forms(word, stemmer)}
+
+    def __len__(self):
+        return len(self.index)
+
+    # ==== Skor per teks ====
+    def polarity(self, text):
+        # Jumlah kata positif dikurangi jumlah kata negatif
+        return sum(self.index[w][0] for w in text.split() if w in self.index)
+
+    def sentiment(self, text):
+        return SENTIMENT_LABELS[int(np.sign(self.polarity(text))) + 1]
+
+    def emotion(self, text, no_emotion="Netral"):
+        scores = [0] * len(self.emotions)
+        for word in text.split():
+            entry = self.index.get(word)
+            if entry:
+                for emotion_id in entry[1]:
+                    scores[emotion_id] += 1
+        if not any(scores):
+            return no_emotion
+        return self.emotions[scores.index(max(scores))]
+
+    # ==== Skor satu DataFrame sekaligus (X @ W) ====
+    def weights(self, vocab):
+        rows, cols, vals = [], [], []
+        for i, token in enumerate(vocab):
+            entry = self.index.get(token)
+            if entry is None:
+                continue
+            polarity, emotion_ids = entry
+            if polarity:
+                rows.append(i)
+                cols.append(0)
+                vals.append(polarity)
+            for emotion_id in emotion_ids:
+                rows.append(i)
+                cols.append(emotion_id + 1)
+                vals.append(1)
+        shape = (len(vocab), len(self.emotions) + 1)
+        return sparse.csr_matrix((vals, (rows, cols)), shape=shape, dtype=np.int32)
+
+    def polarities(self, X, vocab):
+        return np.asarray((X @ self.weights(vocab)[:, 0]).todense()).ravel()
+
+    def score(self, X, vocab, no_emotion="Netral"):
+        profiler.count("lexicon.score.items", X.shape[0])
+        with profiler.span("lexicon.score"):
+            return self._score(X, vocab, no_emotion)
+
+    def _score(self, X, vocab, no_emotion):
+        scores = (X @ self.weights(vocab)).toarray()
+        sentimen = SENTIMENT_LABELS[np.sign(scores[:, 0]) + 1]
+
+        emotion_scores = scores[:, 1:]
+        emosi = np.full(len(scores), no_emotion, dtype=object)
+        if emotion_scores.shape[1]:
+            matched = emotion_scores.max(axis=1) > 0
+            best = emotion_scores.argmax(axis=1)
+            emosi[matched] = np.array(self.emotions, dtype=object)[best[matched]]
+
+        return pd.DataFrame({"sentimen": sentimen, "emosi": emosi})
@@ -1,190 +1,116 @@
 import streamlit as st
 import pandas as pd
-import os
-import re
-import nltk
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-from playwright.sync_api import sync_playwright
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-from wordcloud import WordCloud
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-
-nltk.download('punkt')
-nltk.download('stopwords')
-
-# ==== Load Stopwords ====
-def load_stopwords(file_path):
-    stopwords_list = set(stopwords.words("indonesian"))
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            additional_stopwords = {line.strip() for line in f.readlines()}
-        stopwords_list.update(additional_stopwords)
-    except Exception as e:
-        st.warning(f"Terjadi kesalahan saat memuat stopword list dari file: {e}")
-    return stopwords_list
 
-stop_words = load_stopwords("stopwords.txt")
-factory = StemmerFactory()
-stemmer = factory.create_stemmer()
+from preprocessing import root_words
+from streaming import analyze_frame, find_comment_column
+from dedup import WEIGHT_COL, collapse_duplicates, weighted_counts
+from browser_pool import get_browser_pool
+from scroll_extract import scroll_and_extract
+from async_scraper import scrape_many
+from downloader import fetch_comments
+from export import read_table, strip_results, with_root_words
+from profiling import profiler
+from rendering import bar_chart, export_downloads, lazy_download, profiling_panel, profiling_sidebar, wordcloud
+from resources import get_result, load_lexicon_index, load_stem_cache, load_stop_words, store_result
+
+# Playwright hanya dimuat saat sumber TikTok/Google Maps di-scrape, sklearn dan library grafik di tahapnya masing-masing
 
 # ==== Scraper YouTube ====
 def scrape_youtube_comments(url, limit=300):
-    output_file = "comments.csv"
-    if os.path.exists(output_file):
-        os.remove(output_file)
-    cmd = [
-        "youtube-comment-downloader",
-        "--url", url,
-        "--output", output_file,
-        "--limit", str(limit)
-    ]
-    import subprocess
-    subprocess.run(cmd)
-    return pd.read_csv(output_file, on_bad_lines='skip', quoting=3, encoding='utf-8')
+    return fetch_comments(url, sort_by="top", count=limit)
 
 # ==== Scraper TikTok ====
+def _scrape_tiktok_comments(page, url, limit):
+    page.goto(url)
+    try:
+        page.wait_for_selector('[data-e2e="comment-list-item"]', timeout=10000)
+    except:
+        pass
+    items = scroll_and_extract(page, '[data-e2e="comment-list-item"]', ['[data-e2e="comment-level-1"]'], limit, max_scrolls=20)
+    return pd.DataFrame([item["text"] for item in items], columns=["comment"])
+
 def scrape_tiktok_comments(url, limit=300):
-    comments = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        page.goto(url)
-        page.wait_for_timeout(3000)
-        for _ in range(20):
-            page.mouse.wheel(0, 5000)
-            page.wait_for_timeout(1000)
-            comment_elements = page.query_selector_all('[data-e2e="comment-list-item"]')
-            for comment_el in comment_elements:
-                try:
-                    text_el = comment_el.query_selector('[data-e2e="comment-level-1"]')
-                    if text_el:
-                        comment = text_el.inner_text().strip()
-                        if comment and comment not in comments:
-                            comments.append(comment)
-                    if len(comments) >= limit:
-                        break
-                except:
-                    continue
-            if len(comments) >= limit:
-                break
-        browser.close()
-    return pd.DataFrame(comments[:limit], columns=["comment"])
+    return get_browser_pool().run(_scrape_tiktok_comments, url, limit)
 
 # ==== Scraper Google Maps ====
+def _scrape_google_maps_reviews(page, place_url, limit):
+    page.goto(place_url)
+    review_selector = "div[jscontroller='e6Mltc']"
+    try:
+        review_button = page.wait_for_selector("button[jsaction='pane.reviewChart.moreReviews']", timeout=10000)
+        if review_button:
+            review_button.click()
+            page.wait_for_selector(review_selector, timeout=10000)
+    except:
+        pass
+    items = scroll_and_extract(
+        page,
+        review_selector,
+        ["span[jsname='fbQN7e']", "span[jsname='bN97Pc']"],
+        limit,
+        key_attr="data-review-id",
+        max_scrolls=30,
+    )
+    return pd.DataFrame([item["text"] for item in items], columns=["comment"])
+
 def scrape_google_maps_reviews(place_url, limit=100):
-    comments = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        page.goto(place_url)
-        page.wait_for_timeout(5000)
-        try:
-            review_button = page.query_selector("button[jsaction='pane.reviewChart.moreReviews']")
-            if review_button:
-                review_button.click()
-                page.wait_for_timeout(5000)
-        except:
-            pass
-        scrollable_div_selector = 'div[aria-label="Ulasan"]'
-        scrollable = page.query_selector(scrollable_div_selector)
-        for _ in range(30):
-            page.keyboard.press("PageDown")
-            page.wait_for_timeout(1000)
-            review_elements = page.query_selector_all("div[jscontroller='e6Mltc']")
-            for el in review_elements:
-                try:
-                    content = el.query_selector("span[jsname='fbQN7e']") or el.query_selector("span[jsname='bN97Pc']")
-                    if content:
-                        text = content.inner_text().strip()
-                        if text and text not in comments:
-                            comments.append(text)
-                    if len(comments) >= limit:
-                        break
-                except:
-                    continue
-            if len(comments) >= limit:
-                break
-        browser.close()
-    return pd.DataFrame(comments[:limit], columns=["comment"])
+    return get_browser_pool().run(_scrape_google_maps_reviews, place_url, limit)
+
+# ==== Scrape banyak URL sekaligus ====
+def scrape_multiple_sources(urls, platform_key, limit):
+    progress = st.progress(0.0, text="Mengambil komentar dari beberapa sumber...")
+    frames = []
+
+    def on_result(result):
+        if result.error:
+            st.warning(f"Gagal mengambil {result.url}: {result.error}")
+        frames.append(pd.DataFrame({"comment": result.comments, "sumber": result.url}))
+        progress.progress(len(frames) / len(urls), text=f"{len(frames)}/{len(urls)} sumber selesai")
+
+    scrape_many([(u, platform_key) for u in urls], limit, on_result=on_result)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["comment", "sumber"])
 
 # ==== Preprocessing ====
 def get_root_words(text):
-    text = str(text).lower()
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    words = text.split()
-    return [stemmer.stem(w) for w in words if w not in stop_words and len(w) > 1]
+    return root_words(text, load_stop_words("stopwords.txt"), load_stem_cache())
 
 def clean_text(text):
     return " ".join(get_root_words(text))
 
 # ==== Sentiment Analysis ====
-def load_lexicon(file_path):
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return set(line.strip() for line in f.readlines())
-    except Exception as e:
-        st.warning(f"Gagal memuat kamus dari {file_path}: {e}")
-        return set()
-
-positive_words = load_lexicon("positif.txt")
-negative_words = load_lexicon("negatif.txt")
-
 def get_sentiment(text):
-    words = text.split()
-    pos = sum(1 for w in words if w in positive_words)
-    neg = sum(1 for w in words if w in negative_words)
-    if pos > neg:
-        return "Positif"
-    elif neg > pos:
-        return "Negatif"
-    else:
-        return "Netral"
+    return load_lexicon_index().sentiment(text)
 
 # ==== Emotion Detection ====
-def load_emotion_lexicon(file_path):
-    emotions = {}
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if ":" in line:
-                    emotion, words = line.strip().split(":")
-                    emotions[emotion.strip()] = set(w.strip() for w in words.split(","))
-    except Exception as e:
-        st.warning(f"Gagal memuat leksikon emosi dari {file_path}: {e}")
-    return emotions
-
-emotion_lexicon = load_emotion_lexicon("emosi.txt")
-
 def get_emotion(text):
-    words = text.split()
-    scores = {e: 0 for e in emotion_lexicon}
-    for word in words:
-        for emotion, wordlist in emotion_lexicon.items():
-            if word in wordlist:
-                scores[emotion] += 1
-    if not any(scores.values()):
-        return
-    return max(scores, key=scores.get)
+    return load_lexicon_index().emotion(text, no_emotion=None)
 
 # ==== UI ====
 st.title("Analisis Komentar: YouTube, TikTok, Google Maps (Bahasa Indonesia)")
+profiling_sidebar()
 
 platform = st.selectbox("Pilih Platform:", ["YouTube", "TikTok", "Google Maps"])
 url = st.text_input("Masukkan URL video / tempat:", "")
+extra_urls = st.text_area("URL tambahan (opsional, satu per baris):", "") if platform != "YouTube" else ""
+uploaded = st.file_uploader("Atau muat file hasil/komentar sebelumnya untuk dianalisis ulang tanpa scraping:", type=["parquet", "csv", "jsonl"])
 limit = st.slider("Jumlah komentar:", 50, 1000, 300, 50)
+parallel = st.checkbox("Preprocessing paralel (multi-core)", value=True)
+fast_render = st.checkbox("Mode tampilan cepat (grafik bawaan, word cloud resolusi rendah)")
+dedupe = st.checkbox("Gabungkan komentar duplikat/spam (MinHash)", value=True)
 
-if st.button("Analisis Sekarang") and url:
-    with st.spinner("Mengambil komentar..."):
+urls = [url] + [u.strip() for u in extra_urls.splitlines() if u.strip()]
+run_key = (("file", uploaded.name, uploaded.size) if uploaded else (tuple(urls), limit, platform), dedupe)
+
+if st.button("Analisis Sekarang") and (url or uploaded):
+    profiler.reset()
+    with st.spinner("Mengambil komentar..."), profiler.span("ingest"):
         try:
-            if platform == "YouTube":
+            if uploaded:
+                df = strip_results(read_table(uploaded, uploaded.name))
+            elif platform == "YouTube":
                 df = scrape_youtube_comments(url, limit)
+            elif len(urls) > 1:
+                df = scrape_multiple_sources(urls, "tiktok" if platform == "TikTok" else "google_maps", limit)
             elif platform == "TikTok":
                 df = scrape_tiktok_comments(url, limit)
             elif platform == "Google Maps":
@@ -197,63 +123,72 @@ if st.button("Analisis Sekarang") and url:
             st.error(f"Gagal mengambil komentar: {e}")
             st.stop()
 
-    comment_col = next((col for col in df.columns if "text" in col.lower() or "comment" in col.lower()), None)
+    profiler.count("ingest.items", len(df))
+    comment_col = find_comment_column(df.columns)
     if not comment_col:
         st.error("Kolom komentar tidak ditemukan.")
         st.stop()
 
-    df["root_words"] = df[comment_col].astype(str).apply(get_root_words)
-    df["clean_text"] = df["root_words"].apply(lambda x: " ".join(x))
-    df = df[df["clean_text"].str.strip() != ""]
+    with st.spinner("Memuat kamus dan stemmer..."):
+        stop_words = load_stop_words("stopwords.txt")
+        stem_cache = load_stem_cache()
+        lexicon_index = load_lexicon_index()
+
+    if dedupe:
+        # Satu representatif per grup near-duplicate yang dianalisis, ukuran grup jadi bobot
+        n_comments = len(df)
+        df, _ = collapse_duplicates(df, comment_col)
+        st.caption(f"{n_comments} komentar digabung menjadi {len(df)} grup (near-duplicate/spam).")
+
+    # Token id dari preprocessing langsung dipakai untuk skor leksikon dan topik
+    df, X_all, vocab_all, corpus = analyze_frame(df, comment_col, stop_words, stem_cache, lexicon_index, no_emotion=None, parallel=parallel)
+    stem_cache.save()
+    cache_stats = stem_cache.stats()
+    st.caption(f"Cache stemming: {cache_stats['hits']} hit, {cache_stats['misses']} miss ({cache_stats['hit_rate']:.0%})")
 
     if df.empty:
         st.error("Semua komentar kosong setelah dibersihkan.")
         st.stop()
 
-    df["sentimen"] = df["clean_text"].apply(get_sentiment)
-    df["emosi"] = df["clean_text"].apply(get_emotion)
+    from topics import load_topic_model, save_topic_model, summarize_topics
+
+    topic_key = f"file:{uploaded.name}" if uploaded else f"{platform}:" + ",".join(sorted(urls))
+    topic_model = load_topic_model(topic_key)
+    topic_model.update(X_all, vocab_all, df["clean_text"])
+    save_topic_model(topic_model, topic_key)
+
+    summary = summarize_topics(topic_model, 10)
+    store_result(run_key, {"df": df, "corpus": corpus, "comment_col": comment_col, "topics": summary})
+
+# ==== Hasil (tetap tampil saat widget lain diubah) ====
+analysis = get_result(run_key)
+if analysis:
+    df, corpus, comment_col, summary = analysis["df"], analysis["corpus"], analysis["comment_col"], analysis["topics"]
 
     st.subheader("Distribusi Sentimen")
-    counts = df["sentimen"].value_counts()
-    fig, ax = plt.subplots()
     sentimen_colors = {"Positif": "#4CAF50", "Negatif": "#F44336", "Netral": "#9E9E9E"}
-    sns.barplot(x=counts.index, y=counts.values, ax=ax, palette=[sentimen_colors.get(s, "#607D8B") for s in counts.index])
-    ax.set_ylabel("Jumlah Komentar")
-    st.pyplot(fig)
+    bar_chart(weighted_counts(df, "sentimen"), palette=sentimen_colors, fast=fast_render)
 
     st.subheader("Distribusi Emosi")
-    emotion_counts = df["emosi"].value_counts()
     emotion_colors = {"senang": "#4CAF50", "sedih": "#2196F3", "marah": "#F44336", "takut": "#9C27B0"}
-    fig, ax = plt.subplots()
-    sns.barplot(x=emotion_counts.index, y=emotion_counts.values, ax=ax, palette=[emotion_colors.get(e, "#607D8B") for e in emotion_counts.index])
-    ax.set_ylabel("Jumlah Komentar")
-    st.pyplot(fig)
+    bar_chart(weighted_counts(df, "emosi"), palette=emotion_colors, fast=fast_render)
 
     st.subheader("Topik Komentar (LDA + WordCloud)")
-    vectorizer = CountVectorizer(max_df=0.9, min_df=2)
-    X = vectorizer.fit_transform(df["clean_text"])
-    lda = LatentDirichletAllocation(n_components=5, random_state=42)
-    lda.fit(X)
-
-    vocab = vectorizer.get_feature_names_out()
-    combined_word_freq = {}
-    for i, topic in enumerate(lda.components_):
-        top_idx = topic.argsort()[:-11:-1]
-        top_words = [(vocab[j], topic[j]) for j in top_idx]
-        label = vocab[top_idx[0]]
-        st.markdown(f"#### Topik {i+1}: {label.capitalize()}")
-        st.write(", ".join(w for w, _ in top_words))
-        for w, score in top_words:
-            combined_word_freq[w] = combined_word_freq.get(w, 0) + score
-
-    st.markdown("#### Word Cloud Gabungan")
-    wc = WordCloud(width=800, height=500, background_color="white").generate_from_frequencies(combined_word_freq)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.imshow(wc, interpolation="bilinear")
-    ax.axis("off")
-    st.pyplot(fig)
+    if not summary.topics:
+        st.info("Komentar belum cukup untuk membentuk topik.")
+    else:
+        for i, (label, top_words) in enumerate(zip(summary.labels, summary.topics)):
+            st.markdown(f"#### Topik {i+1}: {label.capitalize()}")
+            st.write(", ".join(w for w, _ in top_words))
+
+        st.markdown("#### Word Cloud Gabungan")
+        wordcloud(summary.frequencies, fast=fast_render)
 
     with st.expander("🔍 Lihat Data Lengkap"):
-        st.dataframe(df[[comment_col, "root_words", "clean_text", "sentimen"]])
-        st.download_button("Unduh Data", df.to_csv(index=False).encode('utf-8'), "data.csv", "text/csv")
-        st.download_button("Unduh Komentar", df[comment_col].to_csv(index=False).encode('utf-8'), "komentar.csv", "text/csv")
+        view = with_root_words(df, corpus)
+        st.dataframe(view[[c for c in (comment_col, "root_words", "clean_text", "sentimen", WEIGHT_COL) if c in view.columns]])
+        downloads = analysis.setdefault("downloads", {})
+        export_downloads(downloads, "data", df, "data", corpus=corpus)
+        lazy_download(downloads, "komentar", "Unduh Komentar", lambda: df[comment_col].to_csv(index=False).encode("utf-8"), "komentar.csv", "text/csv")
+
+profiling_panel()
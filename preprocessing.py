@@ -0,0 +1,134 @@
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from corpus import TokenCorpus
+from profiling import profiler
+from stem_cache import StemCache, create_stemmer
+
+# Di bawah jumlah ini biaya start worker lebih besar dari hasilnya
+PARALLEL_MIN_ROWS = 500
+
+URL_PATTERN = re.compile(r"http\S+")
+NON_ALPHA_PATTERN = re.compile(r"[^a-zA-Z\s]")
+
+_worker_stop_words = None
+_worker_stem_cache = None
+
+
+# ==== Stopwords ====
+def load_stopword_set(file_path="stopwords.txt"):
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        stop_words = set(stopwords.words("indonesian"))
+    except LookupError:
+        nltk.download("stopwords", quiet=True)
+        try:
+            stop_words = set(stopwords.words("indonesian"))
+        except LookupError:
+            # Offline tanpa korpus NLTK: cukup pakai stopwords.txt
+            stop_words = set()
+    if file_path:
+        with open(file_path, "r", encoding="utf-8") as f:
+            stop_words.update(line.strip() for line in f)
+    return stop_words
+
+
+# ==== Preprocessing ====
+def normalize_text(text):
+    text = str(text).lower()
+    text = URL_PATTERN.sub("", text)
+    return NON_ALPHA_PATTERN.sub("", text)
+
+
+def stem_tokens(text, stop_words, stem_cache):
+    return [stem_cache.stem(w) for w in text.split() if w not in stop_words and len(w) > 1]
+
+
+def root_words(text, stop_words, stem_cache):
+    return stem_tokens(normalize_text(text), stop_words, stem_cache)
+
+
+def normalize_series(series):
+    # pandas >= 3 membiarkan NaN lolos dari astype(str); factorize lalu memberi kode -1
+    texts = series.fillna("").astype(str).str.lower()
+    texts = texts.str.replace(URL_PATTERN, "", regex=True)
+    return texts.str.replace(NON_ALPHA_PATTERN, "", regex=True)
+
+
+# ==== Worker process pool ====
+def _init_worker(stop_words):
+    global _worker_stop_words, _worker_stem_cache
+    _worker_stop_words = stop_words
+    _worker_stem_cache = StemCache(create_stemmer())
+    _worker_stem_cache.new_roots = []
+
+
+def _process_chunk(texts):
+    hits, misses = _worker_stem_cache.hits, _worker_stem_cache.misses
+    results = [stem_tokens(t, _worker_stop_words, _worker_stem_cache) for t in texts]
+    # Kata yang baru di-stem di worker dikirim balik supaya ikut masuk cache persisten proses utama
+    new_roots, _worker_stem_cache.new_roots = _worker_stem_cache.new_roots, []
+    return results, _worker_stem_cache.hits - hits, _worker_stem_cache.misses - misses, new_roots
+
+
+def _split_chunks(texts, n_chunks):
+    size = max(1, math.ceil(len(texts) / n_chunks))
+    return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+
+def create_stem_pool(stop_words, n_jobs=None):
+    # Pool yang dipakai ulang lintas batch, supaya stemmer di worker tidak dibuat ulang tiap panggilan
+    return ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count() or 1, initializer=_init_worker, initargs=(stop_words,))
+
+
+def stem_texts(texts, stop_words, stem_cache, parallel=True, n_jobs=None, min_rows=PARALLEL_MIN_ROWS, pool=None):
+    n_jobs = n_jobs or os.cpu_count() or 1
+    # Pool yang sudah jalan tidak punya biaya start, jadi batas min_rows hanya berlaku tanpa pool
+    if not parallel or n_jobs <= 1 or not texts or (pool is None and len(texts) < min_rows):
+        return [stem_tokens(t, stop_words, stem_cache) for t in texts]
+
+    # Beberapa chunk per worker supaya beban tetap rata
+    chunks = _split_chunks(texts, n_jobs * 4)
+    results = []
+    own_pool = pool is None
+    pool = pool or create_stem_pool(stop_words, n_jobs)
+    try:
+        for chunk_results, hits, misses, new_roots in pool.map(_process_chunk, chunks):
+            results.extend(chunk_results)
+            stem_cache.hits += hits
+            stem_cache.misses += misses
+            stem_cache.update(new_roots)
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return results
+
+
+# ==== Batch cleaning (unik dulu, lalu disebar ke semua baris) ====
+def encode_series(series, stop_words, stem_cache, vocabulary=None, parallel=True, n_jobs=None, min_rows=PARALLEL_MIN_ROWS, pool=None):
+    # Hasil: kode baris -> teks unik, dan korpus token id untuk teks unik tersebut
+    hits, misses = stem_cache.hits, stem_cache.misses
+    with profiler.span("preprocess"):
+        codes, uniques = pd.factorize(normalize_series(series))
+        with profiler.span("preprocess.stem"):
+            unique_roots = stem_texts(list(uniques), stop_words, stem_cache, parallel, n_jobs, min_rows, pool)
+        corpus = TokenCorpus.from_token_lists(unique_roots, vocabulary)
+    profiler.count("preprocess.items", len(series))
+    profiler.count("preprocess.stem.items", len(uniques))
+    profiler.count("stem_cache.hits", stem_cache.hits - hits)
+    profiler.count("stem_cache.misses", stem_cache.misses - misses)
+    return codes, corpus
+
+
+def clean_text_column(codes, unique_corpus, index=None):
+    # Satu str per teks unik, baris duplikat hanya menunjuk ke objek yang sama.
+    # root_words (list per baris) tidak disimpan; export membangunnya dari TokenCorpus hasil analisis.
+    clean = np.array(unique_corpus.texts(), dtype=object)
+    return pd.Series(clean[codes], index=index, name="clean_text")
@@ -0,0 +1,163 @@
+import contextvars
+import json
+import threading
+import time
+
+# Nama counter dengan akhiran ini dipakai untuk metrik turunan di report()
+ITEMS_SUFFIX = ".items"
+HITS_SUFFIX = ".hits"
+MISSES_SUFFIX = ".misses"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+# ==== Profiler per tahap: span waktu, counter, dan observasi (mis. ukuran batch model) ====
+# Saat tidak aktif, span() mengembalikan objek no-op yang sama dan count()/observe() langsung return,
+# jadi biaya instrumentasi cuma satu pengecekan flag per tahap/batch.
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+            self.observations = {}
+            self.started_at = time.time()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def _record_span(self, name, seconds):
+        with self._lock:
+            stats = self.spans.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.observations.setdefault(name, [0, 0.0, value, value])
+            stats[0] += 1
+            stats[1] += value
+            stats[2] = min(stats[2], value)
+            stats[3] = max(stats[3], value)
+
+    def iterate(self, name, iterable):
+        # Waktu yang dihabiskan di dalam next() saja (mis. menunggu jaringan), bukan di konsumen
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iterable)
+
+    def _timed_iter(self, name, iterable):
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._record_span(name, time.perf_counter() - start)
+                return
+            self._record_span(name, time.perf_counter() - start)
+            self.count(name + ITEMS_SUFFIX)
+            yield item
+
+    def report(self):
+        with self._lock:
+            spans = {
+                name: {"calls": calls, "total_s": round(total, 6), "mean_s": round(total / calls, 6), "max_s": round(longest, 6)}
+                for name, (calls, total, longest) in self.spans.items()
+            }
+            counters = dict(self.counters)
+            observations = {
+                name: {"count": n, "mean": total / n, "min": low, "max": high}
+                for name, (n, total, low, high) in self.observations.items()
+            }
+
+        rates = {}
+        for name, value in counters.items():
+            if name.endswith(ITEMS_SUFFIX):
+                stage = name[:-len(ITEMS_SUFFIX)]
+                if stage in spans and spans[stage]["total_s"] > 0:
+                    rates[stage + ".items_per_s"] = round(value / spans[stage]["total_s"], 2)
+            elif name.endswith(HITS_SUFFIX):
+                stage = name[:-len(HITS_SUFFIX)]
+                total = value + counters.get(stage + MISSES_SUFFIX, 0)
+                if total:
+                    rates[stage + ".hit_rate"] = round(value / total, 4)
+        return {
+            "started_at": self.started_at,
+            "elapsed_s": round(time.time() - self.started_at, 3),
+            "spans": spans,
+            "counters": counters,
+            "observations": observations,
+            "rates": rates,
+        }
+
+    def to_json(self, indent=2):
+        # Nilai numpy (mis. jumlah baris dari DataFrame) diubah ke angka Python biasa
+        return json.dumps(self.report(), indent=indent, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+
+
+# ==== Profiler aktif: per sesi Streamlit, atau satu profiler global untuk CLI ====
+# Aplikasi Streamlit mengikat profiler milik sesi ke context run script (use_profiler), jadi
+# toggle, reset, dan data satu pengguna tidak menyentuh sesi lain. Tanpa ikatan (batch_analyze.py,
+# benchmark) semua panggilan jatuh ke profiler global.
+_global_profiler = Profiler()
+_current_profiler = contextvars.ContextVar("profiler", default=None)
+
+
+def current_profiler():
+    return _current_profiler.get() or _global_profiler
+
+
+def use_profiler(profiler):
+    # Thread worker tidak mewarisi context ini; jalankan lewat contextvars.copy_context().run
+    _current_profiler.set(profiler)
+    return profiler
+
+
+class _CurrentProfiler:
+    def __getattr__(self, name):
+        return getattr(current_profiler(), name)
+
+
+profiler = _CurrentProfiler()
@@ -0,0 +1,141 @@
+import io
+
+import streamlit as st
+
+from profiling import Profiler, profiler, use_profiler
+
+DEFAULT_COLOR = "#607D8B"
+WORDCLOUD_SIZE = (800, 500)
+FAST_WORDCLOUD_SIZE = (400, 250)
+MAX_CACHED_IMAGES = 64
+
+
+def _frequency_items(frequencies):
+    # Urutan tetap supaya frekuensi yang sama selalu menghasilkan kunci cache yang sama
+    return tuple(sorted((str(k), float(v)) for k, v in dict(frequencies).items()))
+
+
+def _palette_for(labels, palette):
+    if isinstance(palette, dict):
+        return tuple(palette.get(label, DEFAULT_COLOR) for label in labels)
+    return palette
+
+
+# ==== Gambar PNG di-cache berdasarkan hash input, figure langsung ditutup ====
+@st.cache_data(max_entries=MAX_CACHED_IMAGES, show_spinner=False)
+def render_bar_png(items, palette=None, ylabel="Jumlah Komentar"):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    profiler.count("render.cache.misses")
+    labels = [label for label, _ in items]
+    values = [value for _, value in items]
+    fig, ax = plt.subplots()
+    try:
+        sns.barplot(x=labels, y=values, palette=list(palette) if isinstance(palette, tuple) else palette, ax=ax)
+        ax.set_ylabel(ylabel)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=MAX_CACHED_IMAGES, show_spinner=False)
+def render_wordcloud_png(items, width=WORDCLOUD_SIZE[0], height=WORDCLOUD_SIZE[1]):
+    from wordcloud import WordCloud
+
+    profiler.count("render.cache.misses")
+    # Langsung ke PNG lewat PIL, tanpa figure matplotlib
+    wc = WordCloud(width=width, height=height, background_color="white").generate_from_frequencies(dict(items))
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _cached_image(render, *args):
+    if not profiler.enabled:
+        return render(*args)
+    # Fungsi render hanya jalan saat cache miss, jadi miss yang tidak bertambah berarti hit
+    misses = profiler.counters.get("render.cache.misses", 0)
+    image = render(*args)
+    if profiler.counters.get("render.cache.misses", 0) == misses:
+        profiler.count("render.cache.hits")
+    return image
+
+
+# ==== Tampilkan ke Streamlit (mode cepat: chart bawaan + word cloud resolusi rendah) ====
+def bar_chart(counts, palette=None, ylabel="Jumlah Komentar", fast=False):
+    with profiler.span("render.chart"):
+        if fast:
+            st.bar_chart(counts)
+            return
+        items = tuple((str(label), int(value)) for label, value in counts.items())
+        st.image(_cached_image(render_bar_png, items, _palette_for([label for label, _ in items], palette), ylabel))
+
+
+def wordcloud(frequencies, fast=False):
+    items = _frequency_items(frequencies)
+    if not items:
+        return
+    width, height = FAST_WORDCLOUD_SIZE if fast else WORDCLOUD_SIZE
+    with profiler.span("render.wordcloud"):
+        st.image(_cached_image(render_wordcloud_png, items, width, height))
+
+
+# ==== Unduhan: payload baru dibuat saat diminta, lalu disimpan bersama hasilnya ====
+def lazy_download(payloads, name, label, build, file_name, mime):
+    if name not in payloads:
+        if not st.button(f"Siapkan {label}", key=f"prepare-{name}"):
+            return
+        payloads[name] = build()
+    st.download_button(label, payloads[name], file_name, mime, key=f"download-{name}")
+
+
+def export_downloads(payloads, name, df, file_stem, formats=("parquet", "csv"), corpus=None):
+    from export import EXPORT_FORMATS, with_root_words
+
+    def frame():
+        return with_root_words(df, corpus) if corpus is not None else df
+
+    for fmt in formats:
+        build, ext, mime = EXPORT_FORMATS[fmt]
+        lazy_download(payloads, f"{name}-{fmt}", f"Unduh {fmt.upper()}", lambda build=build: build(frame()), file_stem + ext, mime)
+
+
+# ==== Panel profil di sidebar (opsional) ====
+def profiling_sidebar():
+    # Profiler milik sesi ini saja; saat checkbox mati semua span/counter jadi no-op
+    enabled = st.sidebar.checkbox("⏱️ Tampilkan profil per tahap", key="profiling_enabled")
+    session_profiler = st.session_state.setdefault("profiler", Profiler())
+    session_profiler.enable(enabled)
+    use_profiler(session_profiler)
+    return enabled
+
+
+def profiling_panel():
+    if not profiler.enabled:
+        return
+    import pandas as pd
+
+    report = profiler.report()
+    with st.sidebar:
+        st.subheader("⏱️ Profil per tahap")
+        if not report["spans"]:
+            st.caption("Belum ada data, jalankan analisis dulu.")
+            return
+        spans = pd.DataFrame.from_dict(report["spans"], orient="index").sort_values("total_s", ascending=False)
+        st.dataframe(spans)
+        if report["rates"]:
+            st.markdown("**Throughput & hit rate**")
+            st.dataframe(pd.Series(report["rates"], name="nilai"))
+        if report["observations"]:
+            st.markdown("**Observasi**")
+            st.dataframe(pd.DataFrame.from_dict(report["observations"], orient="index"))
+        st.markdown("**Counter**")
+        st.dataframe(pd.Series(report["counters"], name="jumlah"))
+        st.download_button("Unduh profil (JSON)", profiler.to_json(), "profil.json", "application/json")
+        if st.button("Reset profil"):
+            profiler.reset()
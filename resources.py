@@ -0,0 +1,74 @@
+import streamlit as st
+
+from lexicon import LexiconIndex, read_emotion_lexicon, read_word_list
+from preprocessing import load_stopword_set
+from stem_cache import StemCache, create_stemmer
+
+NLTK_RESOURCES = {"punkt": "tokenizers/punkt", "stopwords": "corpora/stopwords"}
+MAX_STORED_RESULTS = 5
+
+
+# ==== Resource yang dimuat sekali per proses, bukan tiap rerun ====
+@st.cache_resource
+def ensure_nltk_data():
+    import nltk
+
+    # Cek di disk dulu supaya rerun tidak memanggil jaringan dan tetap jalan offline
+    for package, resource in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package, quiet=True)
+
+
+@st.cache_resource
+def load_stop_words(file_path="stopwords.txt"):
+    ensure_nltk_data()
+    try:
+        return frozenset(load_stopword_set(file_path))
+    except Exception as e:
+        st.warning(f"Gagal memuat stopword dari file: {e}")
+        return frozenset(load_stopword_set(None))
+
+
+@st.cache_resource
+def load_stem_cache():
+    return StemCache(create_stemmer())
+
+
+def _read_or_warn(reader, file_path, label, empty):
+    try:
+        return reader(file_path)
+    except Exception as e:
+        st.warning(f"Gagal memuat {label} dari {file_path}: {e}")
+        return empty
+
+
+@st.cache_resource
+def load_lexicon_index(positive_path="positif.txt", negative_path="negatif.txt", emotion_path="emosi.txt"):
+    stem_cache = load_stem_cache()
+    lexicon_index = LexiconIndex(
+        _read_or_warn(read_word_list, positive_path, "kamus", set()),
+        _read_or_warn(read_word_list, negative_path, "kamus", set()),
+        _read_or_warn(read_emotion_lexicon, emotion_path, "leksikon emosi", {}),
+        stem_cache,
+    )
+    stem_cache.save()
+    return lexicon_index
+
+
+# ==== Hasil analisis per sesi, supaya interaksi widget tidak menghitung ulang ====
+def _result_store():
+    return st.session_state.setdefault("analysis_results", {})
+
+
+def get_result(key):
+    return _result_store().get(key)
+
+
+def store_result(key, result):
+    store = _result_store()
+    store.pop(key, None)
+    store[key] = result
+    while len(store) > MAX_STORED_RESULTS:
+        store.pop(next(iter(store)))
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.path.join(".cache", "sentiment_results.sqlite")
+SQLITE_MAX_VARS = 500
+
+
+def normalize_review(text):
+    return " ".join(str(text).split())
+
+
+def text_key(text):
+    return hashlib.sha1(normalize_review(text).encode("utf-8")).hexdigest()
+
+
+# ==== Cache hasil model: (model id, hash teks) -> (label, skor) ====
+class ResultCache:
+    def __init__(self, path=DEFAULT_DB_PATH, max_entries=200000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # Streamlit menjalankan script di thread berbeda tiap rerun
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "model_id TEXT NOT NULL, text_hash TEXT NOT NULL, label TEXT NOT NULL, "
+                "score REAL NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (model_id, text_hash))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    def get_many(self, model_id, keys):
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock, self._conn:
+            for start in range(0, len(keys), SQLITE_MAX_VARS):
+                chunk = keys[start:start + SQLITE_MAX_VARS]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, label, score FROM results WHERE model_id = ? AND text_hash IN ({marks})",
+                    [model_id, *chunk],
+                ).fetchall()
+                for text_hash, label, score in rows:
+                    found[text_hash] = (label, score)
+                self._conn.execute(
+                    f"UPDATE results SET last_used = ? WHERE model_id = ? AND text_hash IN ({marks})",
+                    [now, model_id, *chunk],
+                )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_id, results):
+        now = time.time()
+        rows = [(model_id, key, label, float(score), now) for key, (label, score) in results.items()]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        self._conn.close()
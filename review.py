@@ -1,24 +1,47 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 from scraper import scrape_google_maps_reviews
-from analyzer import analyze_sentiment
+from analyzer import analyze_sentiment, analyze_sentiment_cascade, DEFAULT_CASCADE_MARGIN
+from export import read_table
+from profiling import profiler
+from rendering import export_downloads, profiling_panel, profiling_sidebar
+from resources import get_result, store_result
 
 st.set_page_config(page_title="Analisis Sentimen Google Maps", layout="centered")
 
 st.title("📍 Analisis Sentimen Google Maps Review")
+profiling_sidebar()
 st.write("Upload file atau masukkan URL Google Maps untuk analisis sentimen.")
 
-# --- Upload file CSV ---
-uploaded_file = st.file_uploader("📄 Upload File CSV (kolom: review)", type=["csv"])
+use_cascade = st.checkbox("Mode cascade (leksikon dulu, model hanya untuk ulasan ambigu)")
+margin = st.slider("Margin leksikon minimum", 1, 5, DEFAULT_CASCADE_MARGIN) if use_cascade else DEFAULT_CASCADE_MARGIN
+
+def run_analysis(reviews):
+    profiler.count("analysis.items", len(reviews))
+    with profiler.span("analysis"):
+        if not use_cascade:
+            return analyze_sentiment(reviews)
+        df_result = analyze_sentiment_cascade(reviews, margin=margin)
+    st.caption(f"{df_result.attrs['model_fraction']:.0%} ulasan dikirim ke model.")
+    return df_result
+
+# --- Upload file CSV / hasil sebelumnya ---
+uploaded_file = st.file_uploader("📄 Upload File CSV / Parquet / JSONL (kolom: review)", type=["csv", "parquet", "jsonl"])
 
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-    if "review" not in df.columns:
-        st.error("Kolom 'review' tidak ditemukan.")
-    else:
-        st.success(f"{len(df)} ulasan dimuat.")
-        df_result = analyze_sentiment(df["review"].tolist())
+    upload_key = ("upload", uploaded_file.name, uploaded_file.size, use_cascade, margin)
+    if get_result(upload_key) is None:
+        profiler.reset()
+        df = read_table(uploaded_file, uploaded_file.name)
+        if "review" not in df.columns:
+            st.error("Kolom 'review' tidak ditemukan.")
+        else:
+            st.success(f"{len(df)} ulasan dimuat.")
+            store_result(upload_key, {"df": run_analysis(df["review"].tolist())})
+
+    # Hasil disimpan per sesi, payload unduhan hanya dibuat saat diminta
+    uploaded = get_result(upload_key)
+    if uploaded:
+        df_result = uploaded["df"]
 
         st.subheader("📊 Visualisasi Sentimen")
         counts = df_result["sentimen"].value_counts()
@@ -26,27 +49,37 @@ if uploaded_file:
 
         st.subheader("📥 Unduh Hasil")
         st.dataframe(df_result)
-        csv = df_result.to_csv(index=False).encode("utf-8")
-        st.download_button("Unduh CSV", data=csv, file_name="hasil_sentimen.csv")
+        export_downloads(uploaded.setdefault("downloads", {}), "upload", df_result, "hasil_sentimen")
 
 # --- URL Input ---
 st.markdown("---")
 st.subheader("🔍 Scrape dari Google Maps")
 place_url = st.text_input("Masukkan URL Google Maps tempat")
 
+scrape_key = ("scrape", place_url, use_cascade, margin)
+
 if place_url and st.button("Scrape & Analisis"):
     with st.spinner("Mengambil dan menganalisis ulasan..."):
-        reviews = scrape_google_maps_reviews(place_url, max_reviews=100)
+        profiler.reset()
+        with profiler.span("fetch.scrape"):
+            reviews = scrape_google_maps_reviews(place_url, max_reviews=100)
+        profiler.count("fetch.scrape.items", len(reviews or []))
         if not reviews:
             st.error("Gagal mengambil ulasan.")
         else:
-            df_result = analyze_sentiment(reviews)
+            store_result(scrape_key, {"df": run_analysis(reviews)})
+
+# Hasil scrape disimpan supaya tetap tampil (dan bisa diunduh) setelah rerun
+scraped = get_result(scrape_key) if place_url else None
+if scraped:
+    df_result = scraped["df"]
+
+    st.subheader("📊 Visualisasi Sentimen")
+    counts = df_result["sentimen"].value_counts()
+    st.bar_chart(counts)
 
-            st.subheader("📊 Visualisasi Sentimen")
-            counts = df_result["sentimen"].value_counts()
-            st.bar_chart(counts)
+    st.subheader("📥 Unduh Hasil")
+    st.dataframe(df_result)
+    export_downloads(scraped.setdefault("downloads", {}), "scrape", df_result, "hasil_sentimen_scraped")
 
-            st.subheader("📥 Unduh Hasil")
-            st.dataframe(df_result)
-            csv = df_result.to_csv(index=False).encode("utf-8")
-            st.download_button("Unduh CSV", data=csv, file_name="hasil_sentimen_scraped.csv")
+profiling_panel()
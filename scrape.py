@@ -5,67 +5,49 @@ if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 # Setelah event loop policy diset, baru import lain
-from playwright.sync_api import sync_playwright
-import time
 import streamlit as st
 
+from browser_pool import get_browser_pool
+from scroll_extract import scroll_and_extract
 
-def scrape_google_reviews(place_url, max_reviews):
-    reviews = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(place_url)
-        
+def parse_rating(aria_label):
+    if aria_label and "Rated" in aria_label:
         try:
-            page.wait_for_selector('button[jsaction="pane.reviewChart.moreReviews"]', timeout=10000)
-            see_all_button = page.query_selector('button[jsaction="pane.reviewChart.moreReviews"]')
-            if see_all_button:
-                see_all_button.click()
-                time.sleep(3)
-        except Exception as e:
-            print("Tidak menemukan tombol 'See all reviews' atau timeout:", e)
-
-        review_selector = 'div[data-review-id]'
-        reviews_collected = set()
-
-        while len(reviews) < max_reviews:
-            page.evaluate('window.scrollBy(0, window.innerHeight)')
-            time.sleep(2)
-
-            review_elements = page.query_selector_all(review_selector)
-
-            for review_el in review_elements:
-                review_id = review_el.get_attribute('data-review-id')
-                if review_id in reviews_collected:
-                    continue
-                
-                comment_el = review_el.query_selector('span[jsname="bN97Pc"]')
-                comment = comment_el.inner_text().strip() if comment_el else ''
-
-                star_el = review_el.query_selector('span[role="img"]')
-                rating = None
-                if star_el:
-                    aria_label = star_el.get_attribute('aria-label')
-                    if aria_label and "Rated" in aria_label:
-                        try:
-                            rating = int(aria_label.split()[1])
-                        except:
-                            rating = None
-
-                if comment:
-                    reviews.append({"comment": comment, "rating": rating})
-                    reviews_collected.add(review_id)
-
-                if len(reviews) >= max_reviews:
-                    break
-
-            if len(reviews) >= max_reviews:
-                break
-
-        browser.close()
-    return reviews
+            return int(aria_label.split()[1])
+        except:
+            return None
+    return None
+
+
+def _scrape_google_reviews(page, place_url, max_reviews):
+    page.goto(place_url)
+
+    review_selector = 'div[data-review-id]'
+    try:
+        page.wait_for_selector('button[jsaction="pane.reviewChart.moreReviews"]', timeout=10000)
+        see_all_button = page.query_selector('button[jsaction="pane.reviewChart.moreReviews"]')
+        if see_all_button:
+            see_all_button.click()
+            page.wait_for_selector(review_selector, timeout=10000)
+    except Exception as e:
+        print("Tidak menemukan tombol 'See all reviews' atau timeout:", e)
+
+    items = scroll_and_extract(
+        page,
+        review_selector,
+        ['span[jsname="bN97Pc"]'],
+        max_reviews,
+        key_attr="data-review-id",
+        rating_selector='span[role="img"]',
+        max_scrolls=max_reviews,
+    )
+    return [{"comment": item["text"], "rating": parse_rating(item["rating"])} for item in items]
+
+
+def scrape_google_reviews(place_url, max_reviews):
+    return get_browser_pool().run(_scrape_google_reviews, place_url, max_reviews)
+
 
 # Streamlit UI code sama seperti sebelumnya...
 
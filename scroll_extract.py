@@ -0,0 +1,122 @@
+SCRAPED_MARK = "data-scraped"
+
+# Satu round-trip per scroll: ambil semua item yang belum pernah diambil lalu tandai, hitung jumlah item,
+# dan (kalau scroll) bawa item terakhir ke layar supaya panel ulasan yang scroll sendiri ikut bergerak
+EXTRACT_NEW_ITEMS_JS = """
+({itemSelector, textSelectors, keyAttr, ratingSelector, mark, scroll}) => {
+    const all = document.querySelectorAll(itemSelector);
+    const out = [];
+    for (const el of all) {
+        if (el.hasAttribute(mark)) continue;
+        let text = "";
+        for (const sel of textSelectors) {
+            const node = el.querySelector(sel);
+            if (node && node.innerText.trim()) {
+                text = node.innerText.trim();
+                break;
+            }
+        }
+        // Item yang teksnya belum ter-render tidak ditandai supaya dicoba lagi
+        if (!text) continue;
+        el.setAttribute(mark, "1");
+        let rating = null;
+        if (ratingSelector) {
+            const node = el.querySelector(ratingSelector);
+            if (node) rating = node.getAttribute("aria-label");
+        }
+        out.push({key: keyAttr ? el.getAttribute(keyAttr) : null, text, rating});
+    }
+    if (scroll) {
+        if (all.length) all[all.length - 1].scrollIntoView({block: "end"});
+        else window.scrollBy(0, window.innerHeight);
+    }
+    return {items: out, count: all.length};
+}
+"""
+
+GREW_JS = "([sel, n]) => document.querySelectorAll(sel).length > n"
+
+
+WAIT_FOR_GROWTH = object()
+
+
+def _scroll_steps(args, limit, max_scrolls, idle_rounds):
+    # Logika loop tanpa I/O: yield (script, arg) untuk page.evaluate, atau (WAIT_FOR_GROWTH, arg)
+    # untuk menunggu node baru; dijalankan oleh versi sync dan async di bawah
+    item_selector = args["itemSelector"]
+    seen = set()
+    items = []
+    scrolls = idle = 0
+
+    while True:
+        # Scroll ikut di evaluate yang sama; kalau limit tercapai di batch ini, scroll itu cuma terbuang sekali
+        scroll = scrolls < max_scrolls and idle < idle_rounds
+        found = yield EXTRACT_NEW_ITEMS_JS, {**args, "scroll": scroll}
+        for item in found["items"]:
+            key = item["key"] or item["text"]
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+            if len(items) >= limit:
+                return items
+
+        if not scroll:
+            return items
+
+        scrolls += 1
+        # Tunggu sampai node baru muncul, bukan tidur dengan durasi tetap
+        grew = yield WAIT_FOR_GROWTH, [item_selector, found["count"]]
+        idle = 0 if grew else idle + 1
+
+
+def _extract_args(item_selector, text_selectors, key_attr, rating_selector):
+    return {
+        "itemSelector": item_selector,
+        "textSelectors": list(text_selectors),
+        "keyAttr": key_attr,
+        "ratingSelector": rating_selector,
+        "mark": SCRAPED_MARK,
+    }
+
+
+def scroll_and_extract(page, item_selector, text_selectors, limit, key_attr=None, rating_selector=None,
+                       max_scrolls=30, wait_timeout=3000, idle_rounds=2):
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    steps = _scroll_steps(_extract_args(item_selector, text_selectors, key_attr, rating_selector), limit, max_scrolls, idle_rounds)
+    result = None
+    try:
+        while True:
+            script, arg = steps.send(result)
+            if script is WAIT_FOR_GROWTH:
+                try:
+                    page.wait_for_function(GREW_JS, arg=arg, timeout=wait_timeout)
+                    result = True
+                except PlaywrightTimeoutError:
+                    result = False
+            else:
+                result = page.evaluate(script, arg)
+    except StopIteration as done:
+        return done.value
+
+
+async def scroll_and_extract_async(page, item_selector, text_selectors, limit, key_attr=None, rating_selector=None,
+                                   max_scrolls=30, wait_timeout=3000, idle_rounds=2):
+    from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+
+    steps = _scroll_steps(_extract_args(item_selector, text_selectors, key_attr, rating_selector), limit, max_scrolls, idle_rounds)
+    result = None
+    try:
+        while True:
+            script, arg = steps.send(result)
+            if script is WAIT_FOR_GROWTH:
+                try:
+                    await page.wait_for_function(GREW_JS, arg=arg, timeout=wait_timeout)
+                    result = True
+                except AsyncPlaywrightTimeoutError:
+                    result = False
+            else:
+                result = await page.evaluate(script, arg)
+    except StopIteration as done:
+        return done.value
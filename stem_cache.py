@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "stem_cache.json")
+
+
+def create_stemmer():
+    # Stemmer bawaan Sastrawi dibungkus CachedStemmer yang cache-nya tidak pernah dibatasi;
+    # StemCache sudah jadi cache-nya, jadi pakai stemmer tanpa cache di dalamnya
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+    stemmer = StemmerFactory().create_stemmer()
+    return getattr(stemmer, "delegatedStemmer", stemmer)
+
+
+# ==== Cache kata -> kata dasar (LRU, disimpan ke disk) ====
+class StemCache:
+    def __init__(self, stemmer, path=DEFAULT_CACHE_PATH, max_size=50000):
+        self.stemmer = stemmer
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # List (word, root) hasil cache miss, hanya diisi kalau diaktifkan (dipakai worker process)
+        self.new_roots = None
+        self._data = OrderedDict()
+        self._dirty = False
+        # Satu instance dipakai bersama oleh semua sesi Streamlit
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for word, root in data.items():
+            self._data[word] = root
+        self._evict()
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._lock:
+            data = dict(self._data)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def stem(self, word):
+        with self._lock:
+            root = self._data.get(word)
+            if root is not None:
+                self._data.move_to_end(word)
+                self.hits += 1
+                return root
+            self.misses += 1
+        root = self.stemmer.stem(word)
+        with self._lock:
+            self._data[word] = root
+            if self.new_roots is not None:
+                self.new_roots.append((word, root))
+            self._dirty = True
+            self._evict()
+        return root
+
+    def update(self, pairs):
+        # Kata dasar yang di-stem di tempat lain (mis. worker process) ikut disimpan ke cache ini
+        with self._lock:
+            for word, root in pairs:
+                if word not in self._data:
+                    self._data[word] = root
+                    self._dirty = True
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self._dirty = True
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._data)
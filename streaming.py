@@ -0,0 +1,152 @@
+import os
+from collections import Counter
+
+import pandas as pd
+
+from corpus import TokenCorpus, Vocabulary
+from dedup import GROUP_COL, WEIGHT_COL, collapse_duplicates
+from preprocessing import PARALLEL_MIN_ROWS, clean_text_column, create_stem_pool, encode_series
+
+STREAM_CHUNK_SIZE = 200
+
+
+def find_comment_column(columns):
+    return next((col for col in columns if any(key in col.lower() for key in ("text", "comment", "review"))), None)
+
+
+def iter_chunks(iterable, size=STREAM_CHUNK_SIZE):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==== Preprocessing + skor leksikon untuk satu frame komentar ====
+def analyze_frame(df, comment_col, stop_words, stem_cache, lexicon_index, no_emotion="Netral", parallel=False, n_jobs=None, pool=None, vocabulary=None):
+    codes, unique_corpus = encode_series(df[comment_col], stop_words, stem_cache, vocabulary, parallel, n_jobs, pool=pool)
+    df["clean_text"] = clean_text_column(codes, unique_corpus, df.index)
+
+    # Tokenisasi cukup sekali: DTM dibangun langsung dari token id, bukan dari clean_text
+    keep = unique_corpus.lengths[codes] > 0
+    df = df[keep]
+    # Token per baris hasil (sejajar dengan df), dipakai lagi untuk export dan bobot topik
+    corpus = unique_corpus.take(codes[keep])
+    if df.empty:
+        return df, None, None, corpus
+
+    X, vocab = corpus.to_matrix()
+    scores = lexicon_index.score(X, vocab, no_emotion=no_emotion)
+    df["sentimen"] = scores["sentimen"].values
+    df["emosi"] = scores["emosi"].values
+    return df, X, vocab, corpus
+
+
+# ==== Analisis bertahap per chunk komentar ====
+# Tiap baris diproses independen, jadi hasil gabungan sama dengan analisis satu batch.
+# Dengan dedup (NearDuplicateIndex), hanya satu representatif per grup near-duplicate yang
+# dianalisis; jumlah anggota grup masuk ke distribusi sebagai bobot.
+# Mode paralel memakai satu pool worker untuk seluruh stream (tutup dengan close()), dibuat begitu
+# jumlah komentar mencapai PARALLEL_MIN_ROWS, karena chunk kecil sendiri tidak pernah lolos batas itu.
+class StreamingAnalysis:
+    def __init__(self, stop_words, stem_cache, lexicon_index, comment_col=None, no_emotion="Netral", parallel=False, dedup=None, n_jobs=None):
+        self.stop_words = stop_words
+        self.stem_cache = stem_cache
+        self.lexicon_index = lexicon_index
+        self.comment_col = comment_col
+        self.no_emotion = no_emotion
+        self.parallel = parallel
+        self.dedup = dedup
+        self.n_jobs = n_jobs
+        self.pool = None
+        self.sentiment_counts = Counter()
+        self.emotion_counts = Counter()
+        self.received = 0
+        self.batches = []
+        self.vocabulary = Vocabulary()
+        self._frames = []
+        self._corpora = []
+        self._labels = {}
+
+    def _stem_pool(self):
+        if self.pool is None and self.parallel and self.received >= PARALLEL_MIN_ROWS and (self.n_jobs or os.cpu_count() or 1) > 1:
+            self.pool = create_stem_pool(self.stop_words, self.n_jobs)
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _add_duplicates(self, groups, weights):
+        # Duplikat dari representatif di chunk sebelumnya: cukup tambah bobot label yang sudah ada
+        counts = Counter()
+        for group, weight in zip(groups, weights):
+            counts[group] += weight
+        for group, count in counts.items():
+            labels = self._labels.get(group)
+            if labels is not None:
+                self.sentiment_counts[labels[0]] += count
+                self.emotion_counts[labels[1]] += count
+
+    def add_chunk(self, comments):
+        df = pd.DataFrame(comments, index=pd.RangeIndex(self.received, self.received + len(comments)))
+        self.received += len(comments)
+        if self.comment_col is None:
+            self.comment_col = find_comment_column(df.columns)
+        if self.comment_col is None or df.empty:
+            return df
+
+        if self.dedup is not None:
+            offset = self.dedup.n
+            weights = df[WEIGHT_COL].fillna(1).astype(int) if WEIGHT_COL in df.columns else pd.Series(1, index=df.index)
+            df, groups = collapse_duplicates(df, self.comment_col, self.dedup)
+            earlier = groups < offset
+            self._add_duplicates(groups[earlier].tolist(), weights[earlier].tolist())
+            if df.empty:
+                return df
+
+        df, X, vocab, corpus = analyze_frame(df, self.comment_col, self.stop_words, self.stem_cache, self.lexicon_index,
+                                             self.no_emotion, self.parallel, self.n_jobs, self._stem_pool(), self.vocabulary)
+        if df.empty:
+            return df
+
+        # DTM per chunk dipakai ulang sebagai minibatch topic model online
+        self.batches.append((X, vocab, df["clean_text"]))
+        if WEIGHT_COL in df.columns:
+            # Tanpa dedup, bobot bisa datang dari file export yang dimuat ulang
+            weights = df[WEIGHT_COL].fillna(1).astype(int)
+            if self.dedup is not None:
+                self._labels.update(zip(df[GROUP_COL], zip(df["sentimen"], df["emosi"])))
+            for sentimen, emosi, weight in zip(df["sentimen"], df["emosi"], weights):
+                self.sentiment_counts[sentimen] += weight
+                self.emotion_counts[emosi] += weight
+        else:
+            self.sentiment_counts.update(df["sentimen"])
+            self.emotion_counts.update(df["emosi"])
+        self._frames.append(df)
+        self._corpora.append(corpus)
+        return df
+
+    def result(self):
+        if not self._frames:
+            return pd.DataFrame()
+        df = pd.concat(self._frames)
+        if self.dedup is not None:
+            # Bobot akhir termasuk duplikat yang datang di chunk berikutnya
+            df[WEIGHT_COL] = df[GROUP_COL].map(self.dedup.counts).astype(int)
+        return df
+
+    def corpus(self):
+        # Sejajar dengan baris result(); semua chunk memakai vocabulary stream yang sama
+        return TokenCorpus.concat(self._corpora, self.vocabulary)
@@ -0,0 +1,112 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("streamlit")
+
+from analyzer import build_backend, classify_texts
+
+WORDS = ["bagus", "jelek", "mantap", "kecewa", "tempat", "ini", "sangat", "pelayanan", "ramah", "lambat"]
+TEXTS = [
+    "bagus",
+    "pelayanan sangat lambat dan tempat ini jelek sekali",
+    "mantap",
+    "bagus",
+    "tempat ini ramah",
+    "pelayanan sangat lambat dan tempat ini jelek sekali",
+    "kecewa",
+    "ramah ramah ramah ramah ramah ramah ramah ramah ramah ramah",
+]
+
+
+class CountingModel:
+    # Bungkus model untuk mencatat ukuran tiap batch yang benar-benar dikirim ke forward pass
+    def __init__(self, model):
+        self.model = model
+        self.config = model.config
+        self.device = model.device
+        self.batches = []
+
+    def eval(self):
+        self.model.eval()
+        return self
+
+    def __call__(self, **batch):
+        self.batches.append(tuple(batch["input_ids"].shape))
+        return self.model(**batch)
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    vocab_path = tmp_path_factory.mktemp("tiny-bert") / "vocab.txt"
+    vocab_path.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS), encoding="utf-8")
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab_path), do_lower_case=True)
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=64,
+        num_labels=3,
+        id2label={0: "positive", 1: "neutral", 2: "negative"},
+        label2id={"positive": 0, "neutral": 1, "negative": 2},
+    )
+    return transformers.BertForSequenceClassification(config).eval(), tokenizer
+
+
+def test_batched_results_match_per_text_calls(tiny_model):
+    model, tokenizer = tiny_model
+    batched = classify_texts(TEXTS, model, tokenizer, batch_size=3)
+    single = [classify_texts([text], model, tokenizer, batch_size=1)[0] for text in TEXTS]
+
+    assert [label for label, _ in batched] == [label for label, _ in single]
+    assert [score for _, score in batched] == pytest.approx([score for _, score in single], abs=1e-5)
+
+
+def test_duplicates_are_scored_once_in_length_order(tiny_model):
+    model, tokenizer = tiny_model
+    counting = CountingModel(model)
+    results = classify_texts(TEXTS, counting, tokenizer, batch_size=2)
+
+    assert len(results) == len(TEXTS)
+    assert sum(rows for rows, _ in counting.batches) == len(set(TEXTS))
+    # Batch diurutkan dari review terpendek, jadi panjang token per batch tidak pernah turun
+    lengths = [length for _, length in counting.batches]
+    assert lengths == sorted(lengths)
+    assert results[0] == results[3]
+    assert results[1] == results[5]
+
+
+def test_explicit_max_length_truncates(tiny_model):
+    model, tokenizer = tiny_model
+    counting = CountingModel(model)
+    classify_texts(TEXTS, counting, tokenizer, batch_size=8, max_length=4)
+
+    assert max(length for _, length in counting.batches) == 4
+
+
+def test_int8_backend_keeps_labels_close(tiny_model):
+    model, tokenizer = tiny_model
+    quantized = build_backend(model, tokenizer, "int8")
+    expected = classify_texts(TEXTS, model, tokenizer, batch_size=3)
+    results = classify_texts(TEXTS, quantized, tokenizer, batch_size=3)
+
+    assert quantized is not model
+    assert len(results) == len(TEXTS)
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected], abs=0.05)
+
+
+def test_onnx_backend_matches_pytorch(tiny_model, tmp_path):
+    pytest.importorskip("onnxruntime")
+    model, tokenizer = tiny_model
+    onnx_path = tmp_path / "tiny.onnx"
+    backend = build_backend(model, tokenizer, "onnx", onnx_path=str(onnx_path))
+    expected = classify_texts(TEXTS, model, tokenizer, batch_size=3)
+    results = classify_texts(TEXTS, backend, tokenizer, batch_size=3)
+
+    assert onnx_path.exists()
+    assert [label for label, _ in results] == [label for label, _ in expected]
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected], abs=1e-4)
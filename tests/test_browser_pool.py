@@ -0,0 +1,23 @@
+import sys
+
+import pytest
+
+from browser_pool import BrowserPool
+
+
+def test_run_fails_instead_of_hanging_when_playwright_is_missing(monkeypatch):
+    # None di sys.modules membuat import playwright gagal, seperti saat paketnya belum terpasang
+    monkeypatch.setitem(sys.modules, "playwright", None)
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", None)
+
+    pool = BrowserPool(size=2)
+    try:
+        with pytest.raises((RuntimeError, ImportError)):
+            pool.run(lambda page: page.title(), timeout=10)
+        for thread in pool._threads:
+            thread.join(timeout=10)
+        assert pool.dead
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda page: None)
+    finally:
+        pool.close()
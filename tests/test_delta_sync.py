@@ -0,0 +1,63 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("scipy")
+
+from corpus import TokenCorpus
+from delta_sync import sync_video
+
+URL = "https://www.youtube.com/watch?v=abcdefghijk"
+
+
+class FakeDownloader:
+    # Urutan "recent": komentar terbaru dulu; mencatat berapa komentar yang benar-benar diambil
+    def __init__(self, ids):
+        self.ids = ids
+        self.consumed = 0
+
+    def __iter__(self):
+        for i in self.ids:
+            self.consumed += 1
+            yield {"cid": i, "text": f"komentar {i}", "author": "u", "votes": "1", "time": "", "time_parsed": float(int(i[1:]))}
+
+
+def analyze_rows(calls):
+    def analyze(rows):
+        calls.append([row["cid"] for row in rows])
+        return pd.DataFrame(rows).assign(sentimen="Netral"), TokenCorpus.from_token_lists([row["text"].split() for row in rows])
+    return analyze
+
+
+def test_sync_stops_at_seen_ids_and_analyzes_only_new_rows(tmp_path):
+    calls = []
+    first = FakeDownloader([f"c{i}" for i in range(30, 0, -1)])
+    merged, corpus, new_df = sync_video(URL, analyze_rows(calls), generator=first, stop_after_seen=3, state_dir=tmp_path)
+    assert len(merged) == len(new_df) == 30
+    assert calls[-1] == [f"c{i}" for i in range(30, 0, -1)]
+
+    second = FakeDownloader([f"c{i}" for i in range(35, 0, -1)])
+    merged, corpus, new_df = sync_video(URL, analyze_rows(calls), generator=second, stop_after_seen=3, state_dir=tmp_path)
+
+    assert calls[-1] == ["c35", "c34", "c33", "c32", "c31"]
+    # 5 komentar baru + 3 komentar lama berturut-turut, lalu berhenti
+    assert second.consumed == 8
+    assert list(new_df["cid"]) == ["c35", "c34", "c33", "c32", "c31"]
+    assert len(merged) == 35
+    assert merged["cid"].is_unique
+    # Token komentar lama dibaca kembali dari root_words tersimpan, tetap sejajar dengan baris gabungan
+    assert corpus.token_lists() == [text.split() for text in merged["text"]]
+
+
+def test_sync_without_new_comments_returns_stored_data(tmp_path):
+    calls = []
+    ids = [f"c{i}" for i in range(10, 0, -1)]
+    sync_video(URL, analyze_rows(calls), generator=FakeDownloader(ids), stop_after_seen=3, state_dir=tmp_path)
+
+    merged, corpus, new_df = sync_video(URL, analyze_rows(calls), generator=FakeDownloader(ids), stop_after_seen=3, state_dir=tmp_path)
+
+    assert len(calls) == 1
+    assert new_df.empty
+    assert len(merged) == 10
+    assert "root_words" not in merged.columns
+    assert len(corpus) == 10
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+from lexicon import LexiconIndex
+from stem_cache import StemCache
+
+
+class FakeStemmer:
+    ROOTS = {"membantu": "bantu", "menyenangkan": "senang", "mengecewakan": "kecewa"}
+
+    def stem(self, word):
+        return self.ROOTS.get(word, word)
+
+
+def test_empty_stem_cache_still_prestems_lexicon():
+    # Cache baru (belum ada isinya) harus tetap dipakai untuk membuat bentuk dasar leksikon
+    stem_cache = StemCache(FakeStemmer(), path=None)
+    assert len(stem_cache) == 0
+
+    index = LexiconIndex({"membantu"}, {"mengecewakan"}, {}, stem_cache)
+
+    assert index.sentiment("bantu") == "Positif"
+    assert index.sentiment("kecewa") == "Negatif"
+    assert index.sentiment("membantu") == "Positif"
+
+
+def test_raw_lexicon_words_keep_their_polarity():
+    # "menyenangkan" (negatif di kamus) ber-stem "senang" (positif di kamus): kata asli tetap menang
+    stem_cache = StemCache(FakeStemmer(), path=None)
+    index = LexiconIndex({"senang", "membantu"}, {"menyenangkan", "kecewa"}, {}, stem_cache)
+
+    assert index.sentiment("senang") == "Positif"
+    assert index.sentiment("menyenangkan") == "Negatif"
+    assert index.sentiment("bantu") == "Positif"
+    assert index.sentiment("kecewa") == "Negatif"
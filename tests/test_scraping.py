@@ -0,0 +1,60 @@
+import pathlib
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from async_scraper import scrape_many
+from browser_pool import BrowserPool
+from scroll_extract import scroll_and_extract
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "reviews.html"
+ITEM_SELECTOR = "div[data-review-id]"
+TEXT_SELECTORS = ['span[jsname="bN97Pc"]']
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = BrowserPool()
+    try:
+        pool.run(lambda page: None, timeout=60)
+    except Exception as e:
+        pool.close()
+        pytest.skip(f"Chromium untuk Playwright tidak tersedia: {e}")
+    yield pool
+    pool.close()
+
+
+def _extract(url, limit):
+    def run(page):
+        page.goto(url)
+        return scroll_and_extract(page, ITEM_SELECTOR, TEXT_SELECTORS, limit, key_attr="data-review-id", wait_timeout=1000)
+    return run
+
+
+def test_scroll_and_extract_collects_each_review_once(pool):
+    items = pool.run(_extract(FIXTURE.as_uri(), 100))
+
+    assert [item["key"] for item in items] == [f"r{i}" for i in range(35)]
+    assert items[7]["text"] == "Ulasan nomor 7"
+
+
+def test_scroll_and_extract_stops_at_limit(pool):
+    items = pool.run(_extract(FIXTURE.as_uri(), 15))
+
+    assert [item["key"] for item in items] == [f"r{i}" for i in range(15)]
+
+
+def test_scrape_many_isolates_failing_sources(pool):
+    missing = FIXTURE.with_name("tidak-ada.html").as_uri()
+    sources = [(FIXTURE.as_uri(), "google_maps"), (missing, "google_maps"), "https://example.com/bukan-maps"]
+
+    seen = []
+    results = {r.url: r for r in scrape_many(sources, limit=20, retries=1, backoff=0, timeout=5000, on_result=seen.append)}
+
+    assert len(seen) == 3
+    ok = results[FIXTURE.as_uri()]
+    assert ok.error is None
+    assert ok.comments == [f"Ulasan nomor {i}" for i in range(20)]
+    assert results[missing].error and results[missing].attempts == 2
+    assert results["https://example.com/bukan-maps"].attempts == 0
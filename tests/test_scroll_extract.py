@@ -0,0 +1,57 @@
+from scroll_extract import EXTRACT_NEW_ITEMS_JS, WAIT_FOR_GROWTH, _extract_args, _scroll_steps
+
+
+class FakeFeed:
+    # Halaman ulasan tiruan: 10 ulasan per scroll, mencatat berapa kali page.evaluate dipanggil
+    def __init__(self, total, per_scroll=10):
+        self.total = total
+        self.per_scroll = per_scroll
+        self.loaded = per_scroll
+        self.marked = 0
+        self.evaluates = 0
+        self.waits = 0
+
+    def evaluate(self, script, arg):
+        assert script is EXTRACT_NEW_ITEMS_JS
+        self.evaluates += 1
+        items = [{"key": f"r{i}", "text": f"Ulasan nomor {i}", "rating": None} for i in range(self.marked, self.loaded)]
+        count = self.loaded
+        self.marked = self.loaded
+        if arg["scroll"]:
+            self.loaded = min(self.loaded + self.per_scroll, self.total)
+        return {"items": items, "count": count}
+
+    def wait(self, arg):
+        self.waits += 1
+        return self.loaded > arg[1]
+
+
+def run(feed, limit, max_scrolls=30, idle_rounds=2):
+    steps = _scroll_steps(_extract_args("div[data-review-id]", ['span[jsname="bN97Pc"]'], "data-review-id", None), limit, max_scrolls, idle_rounds)
+    result = None
+    try:
+        while True:
+            script, arg = steps.send(result)
+            result = feed.wait(arg) if script is WAIT_FOR_GROWTH else feed.evaluate(script, arg)
+    except StopIteration as done:
+        return done.value
+
+
+def test_each_scroll_is_one_evaluate_plus_wait():
+    feed = FakeFeed(35)
+    items = run(feed, 100)
+
+    assert [item["key"] for item in items] == [f"r{i}" for i in range(35)]
+    # 3 scroll yang menambah ulasan + 2 scroll tanpa hasil (idle_rounds), lalu satu extract terakhir tanpa scroll
+    assert feed.waits == 5
+    assert feed.evaluates == feed.waits + 1
+
+
+def test_stops_at_limit_and_max_scrolls():
+    feed = FakeFeed(35)
+    assert [item["key"] for item in run(feed, 15)] == [f"r{i}" for i in range(15)]
+    assert feed.evaluates == 2
+
+    feed = FakeFeed(1000)
+    assert len(run(feed, 1000, max_scrolls=3)) == 40
+    assert feed.waits == 3
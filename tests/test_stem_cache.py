@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("Sastrawi")
+
+from stem_cache import StemCache, create_stemmer
+
+
+def test_stem_cache_wraps_uncached_sastrawi_stemmer():
+    stemmer = create_stemmer()
+    stem_cache = StemCache(stemmer, path=None, max_size=2)
+
+    assert not hasattr(stemmer, "cache")
+    assert [stem_cache.stem(word) for word in ["membantu", "menyenangkan", "membantu"]] == ["bantu", "senang", "bantu"]
+    assert len(stem_cache) == 2
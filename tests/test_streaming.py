@@ -0,0 +1,86 @@
+import io
+from collections import Counter
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+pytest.importorskip("Sastrawi")
+
+from dedup import NearDuplicateIndex
+from export import read_table, strip_results, to_csv_bytes
+from lexicon import LexiconIndex
+from stem_cache import StemCache
+from streaming import StreamingAnalysis, analyze_frame, iter_chunks
+
+WORDS = ["bagus", "jelek", "senangnya", "sedih", "videonya", "yang", "sangat", "marah", "keren", "dan"]
+STOP_WORDS = frozenset({"yang", "dan", "sangat"})
+COLUMNS = ["cid", "text", "clean_text", "sentimen", "emosi"]
+
+
+class FakeStemmer:
+    def stem(self, word):
+        return word[:-3] if word.endswith("nya") else word
+
+
+def fake_comments(n):
+    # Pengganti generator YoutubeCommentDownloader: ada komentar berulang dan komentar yang kosong setelah dibersihkan
+    for i in range(n):
+        if i % 17 == 0:
+            text = "yang dan 👍"
+        else:
+            text = " ".join(WORDS[(i * k) % len(WORDS)] for k in range(1, 2 + i % 6))
+        yield {"cid": f"c{i}", "text": text, "votes": "0"}
+
+
+def lexicon_index():
+    return LexiconIndex({"bagus", "keren"}, {"jelek"}, {"senang": {"senang"}, "sedih": {"sedih"}, "marah": {"marah"}})
+
+
+def stream_counts(comments, dedup):
+    with StreamingAnalysis(STOP_WORDS, StemCache(FakeStemmer(), path=None), lexicon_index(), dedup=dedup) as stream:
+        for chunk in iter_chunks(comments, 64):
+            stream.add_chunk(chunk)
+    return stream
+
+
+def test_chunked_stream_matches_single_batch():
+    rows = list(fake_comments(450))
+    index = lexicon_index()
+
+    stream = StreamingAnalysis(STOP_WORDS, StemCache(FakeStemmer(), path=None), index)
+    with stream:
+        for chunk in iter_chunks(fake_comments(450), 64):
+            stream.add_chunk(chunk)
+    streamed = stream.result()
+
+    batch, _, _, corpus = analyze_frame(pd.DataFrame(rows), "text", STOP_WORDS, StemCache(FakeStemmer(), path=None), index)
+
+    assert stream.received == len(rows)
+    pd.testing.assert_frame_equal(streamed[COLUMNS], batch[COLUMNS])
+    assert stream.sentiment_counts == Counter(batch["sentimen"])
+    assert stream.emotion_counts == Counter(batch["emosi"])
+    # Token per baris ikut hasil, sejajar dengan baris frame gabungan
+    assert stream.corpus().texts() == corpus.texts() == list(streamed["clean_text"])
+
+
+def test_missing_texts_become_empty_rows():
+    df = pd.DataFrame({"text": ["bagus sekali", None, float("nan"), "bagus sekali"]})
+    result, X, _, _ = analyze_frame(df, "text", STOP_WORDS, StemCache(FakeStemmer(), path=None), lexicon_index())
+
+    assert list(result.index) == [0, 3]
+    assert X.shape[0] == 2
+
+
+@pytest.mark.parametrize("dedup_again", [True, False])
+def test_reanalyzed_dedup_export_keeps_weights(dedup_again):
+    first = stream_counts(fake_comments(450), NearDuplicateIndex())
+    exported = first.result()
+    reloaded = strip_results(read_table(io.BytesIO(to_csv_bytes(exported)), "hasil.csv"))
+
+    again = stream_counts(reloaded.to_dict("records"), NearDuplicateIndex() if dedup_again else None)
+
+    assert len(exported) < first.received
+    assert again.sentiment_counts == first.sentiment_counts
+    assert again.emotion_counts == first.emotion_counts
+    assert again.result()["bobot"].sum() == exported["bobot"].sum()
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import pickle
+from collections import Counter, namedtuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.utils import murmurhash3_32
+
+from profiling import profiler
+
+TOPIC_DIR = os.path.join(".cache", "topics")
+N_FEATURES = 2 ** 18
+
+TopicSummary = namedtuple("TopicSummary", ["topics", "labels", "frequencies"])
+
+
+def hash_token(token, n_features=N_FEATURES):
+    # Stabil antar proses, berbeda dengan hash() bawaan Python
+    return murmurhash3_32(token, positive=True) % n_features
+
+
+def doc_key(text):
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()[:16]
+
+
+def document_frequency_mask(X, min_df=2, max_df=0.9):
+    doc_freq = np.bincount(sparse.csr_matrix(X).indices, minlength=X.shape[1])
+    max_docs = max_df * X.shape[0] if isinstance(max_df, float) else max_df
+    return (doc_freq >= min_df) & (doc_freq <= max_docs)
+
+
+# ==== Topic model online (LDA partial_fit di ruang fitur hash tetap) ====
+class TopicModel:
+    def __init__(self, n_topics=5, n_features=N_FEATURES, passes=5, total_samples=10000, min_df=2, max_df=0.9, random_state=42):
+        self.n_features = n_features
+        self.passes = passes
+        self.min_df = min_df
+        self.max_df = max_df
+        self.lda = LatentDirichletAllocation(
+            n_components=n_topics,
+            learning_method="online",
+            total_samples=total_samples,
+            random_state=random_state,
+        )
+        self.token_counts = Counter()
+        self.seen_docs = set()
+        self.n_docs = 0
+
+    @property
+    def fitted(self):
+        return self.n_docs > 0
+
+    def hash_matrix(self, X, vocab):
+        cols = np.fromiter((hash_token(t, self.n_features) for t in vocab), dtype=np.int64, count=len(vocab))
+        projection = sparse.csr_matrix(
+            (np.ones(len(vocab)), (np.arange(len(vocab)), cols)),
+            shape=(len(vocab), self.n_features),
+        )
+        return sparse.csr_matrix(X @ projection)
+
+    def update(self, X, vocab, texts=None):
+        X = sparse.csr_matrix(X)
+        vocab = np.asarray(vocab, dtype=object)
+        keys = None
+        if texts is not None:
+            # Dokumen yang sudah pernah dipelajari tidak di-fit ulang
+            keys = [doc_key(t) for t in texts]
+            rows = [i for i, key in enumerate(keys) if key not in self.seen_docs]
+            X = X[rows]
+            keys = [keys[i] for i in rows]
+        if X.shape[0] == 0:
+            return 0
+
+        keep = document_frequency_mask(X, self.min_df, self.max_df)
+        if not keep.any():
+            return 0
+        X, vocab = X[:, keep], vocab[keep]
+
+        totals = np.asarray(X.sum(axis=0)).ravel()
+        self.token_counts.update({vocab[j]: int(totals[j]) for j in totals.nonzero()[0]})
+
+        with profiler.span("topics.fit"):
+            X_hashed = self.hash_matrix(X, vocab)
+            for _ in range(self.passes):
+                self.lda.partial_fit(X_hashed)
+        profiler.count("topics.fit.items", X.shape[0])
+        if keys is not None:
+            self.seen_docs.update(keys)
+        self.n_docs += X.shape[0]
+        return X.shape[0]
+
+    def feature_labels(self):
+        # Kalau dua token jatuh ke fitur yang sama, pakai token yang paling sering
+        labels, best = {}, {}
+        for token, count in self.token_counts.items():
+            feature = hash_token(token, self.n_features)
+            if count > best.get(feature, 0):
+                best[feature] = count
+                labels[feature] = token
+        return labels
+
+    def top_words(self, n=10):
+        if not self.fitted:
+            return []
+        labels = self.feature_labels()
+        topics = []
+        for topic in self.lda.components_:
+            order = [j for j in np.argsort(topic)[::-1] if j in labels][:n]
+            topics.append([(j, labels[j], topic[j]) for j in order])
+        return topics
+
+
+# ==== Ringkasan topik: kata teratas, label, dan frekuensi gabungan untuk word cloud ====
+def tfidf_column_means(X):
+    # Rata-rata semua kolom sekaligus, bukan satu slice kolom per kata
+    return np.asarray(TfidfTransformer().fit_transform(X).mean(axis=0)).ravel()
+
+
+def summarize_topics(model, n_words=10, X_hashed=None):
+    # Tanpa X_hashed bobot kata = bobot komponen LDA, dengan X_hashed = rata-rata TF-IDF
+    with profiler.span("topics.summarize"):
+        column_weights = tfidf_column_means(X_hashed) if X_hashed is not None else None
+        topics, labels, frequencies = [], [], {}
+        for topic in model.top_words(n_words):
+            words = [(w, column_weights[j] if column_weights is not None else weight) for j, w, weight in topic]
+            topics.append(words)
+            labels.append(words[0][0])
+            for w, score in words:
+                frequencies[w] = frequencies.get(w, 0) + score
+    return TopicSummary(topics, labels, frequencies)
+
+
+# ==== Simpan / muat model per sumber ====
+def topic_model_path(source_key, topic_dir=TOPIC_DIR):
+    return os.path.join(topic_dir, hashlib.sha1(source_key.encode("utf-8")).hexdigest()[:16] + ".pkl")
+
+
+def load_topic_model(source_key, topic_dir=TOPIC_DIR, **options):
+    path = topic_model_path(source_key, topic_dir)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+    return TopicModel(**options)
+
+
+def save_topic_model(model, source_key, topic_dir=TOPIC_DIR):
+    os.makedirs(topic_dir, exist_ok=True)
+    path = topic_model_path(source_key, topic_dir)
+    with open(f"{path}.tmp", "wb") as f:
+        pickle.dump(model, f)
+    os.replace(f"{path}.tmp", path)